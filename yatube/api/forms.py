@@ -0,0 +1,11 @@
+from django import forms
+
+from posts.forms import PostForm as BasePostForm
+from posts.models import Group
+
+
+class PostForm(BasePostForm):
+    """Форма поста для API: группа задаётся slug, а не id."""
+    group = forms.ModelChoiceField(
+        Group.objects.all(), to_field_name='slug', required=False
+    )
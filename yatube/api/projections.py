@@ -0,0 +1,113 @@
+"""Проекции моделей для JSON API.
+
+Ответы собираются из ``values()``: объекты моделей не создаются,
+а из базы читаются только поля, запрошенные в ``?fields=``.
+Проекция сопоставляет поле ответа пути ORM и, если нужно, функции
+преобразования значения.
+"""
+from django.core.files.storage import default_storage
+
+
+def _media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def _count(value):
+    # У пользователя без записи UserStats счётчики нулевые.
+    return value or 0
+
+
+class Projection:
+    def __init__(self, fields, converters=None):
+        # Поле ответа -> путь для values().
+        self.fields = fields
+        self.converters = converters or {}
+
+    def select(self, names=None):
+        """Поля ответа из строки ``a,b,c``; все поля, если строка пуста.
+
+        Для неизвестных полей бросает ValueError с их списком.
+        """
+        if not names:
+            return list(self.fields)
+        names = [name.strip() for name in names.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(', '.join(unknown))
+        return list(dict.fromkeys(names))
+
+    def values(self, queryset, names, extra=()):
+        """Запрос строк с полями ``names`` и служебными полями ``extra``."""
+        paths = [self.fields[name] for name in names]
+        return queryset.values(*dict.fromkeys([*paths, *extra]))
+
+    def row(self, row, names):
+        item = {}
+        for name in names:
+            value = row[self.fields[name]]
+            converter = self.converters.get(name)
+            item[name] = converter(value) if converter else value
+        return item
+
+    def through(self, relation, **own):
+        """Та же проекция для строк связанной модели.
+
+        ``own`` задаёт поля, которые есть в самой связанной модели
+        и не требуют перехода по связи.
+        """
+        return Projection(
+            {
+                name: own.get(name, f'{relation}__{path}')
+                for name, path in self.fields.items()
+            },
+            self.converters,
+        )
+
+
+POSTS = Projection({
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+    'image_width': 'image_width',
+    'image_height': 'image_height',
+    'comment_count': 'comment_count',
+}, {'image': _media_url})
+
+# Лента подписок читается из TimelineEntry, где есть id и дата поста.
+TIMELINE = POSTS.through('post', id='post_id', pub_date='pub_date')
+
+GROUPS = Projection({
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+})
+
+COMMENTS = Projection({
+    'id': 'id',
+    'post': 'post_id',
+    'author': 'author__username',
+    'text': 'text',
+    'created': 'created',
+})
+
+USERS = Projection({
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'post_count': 'stats__post_count',
+    'follower_count': 'stats__follower_count',
+    'following_count': 'stats__following_count',
+}, {
+    'post_count': _count,
+    'follower_count': _count,
+    'following_count': _count,
+})
+
+FOLLOWS = Projection({
+    'id': 'id',
+    'author': 'author__username',
+})
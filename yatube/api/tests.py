@@ -0,0 +1,247 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, UserStats
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.author,
+                group=cls.group if number % 2 else None,
+            )
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.reader)
+
+    def send(self, method, url, data=None):
+        return getattr(self.client, method)(
+            url, json.dumps(data or {}), content_type='application/json'
+        )
+
+    def test_post_list_pages(self):
+        """Проверка листания списка постов курсором"""
+        url = reverse('api:posts')
+        first = self.client.get(url, {'limit': 3}).json()
+        second = self.client.get(
+            url, {'limit': 3, 'cursor': first['next_cursor']}
+        ).json()
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(ids, [post.pk for post in reversed(self.posts)])
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(first['results'][0]['author'], 'author')
+
+    def test_list_uses_projection(self):
+        """Проверка списка одним запросом без создания объектов"""
+        self.client.logout()
+        with mock.patch.object(
+            Post, 'from_db', side_effect=AssertionError
+        ), self.assertNumQueries(1):
+            response = self.client.get(reverse('api:posts'))
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_field_selection(self):
+        """Проверка выбора полей ответа"""
+        response = self.client.get(
+            reverse('api:posts'), {'fields': 'text,group', 'limit': 1}
+        ).json()
+        self.assertEqual(
+            response['results'], [{'text': 'Пост 4', 'group': None}]
+        )
+        self.assertIsNotNone(response['next_cursor'])
+        response = self.client.get(reverse('api:posts'), {'fields': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_filters(self):
+        """Проверка фильтров списка по группе и автору"""
+        response = self.client.get(reverse('api:posts'), {'group': 'group'})
+        self.assertEqual(len(response.json()['results']), 2)
+        response = self.client.get(reverse('api:posts'), {'author': 'reader'})
+        self.assertEqual(response.json()['results'], [])
+
+    def test_create_post(self):
+        """Проверка создания поста с группой по slug"""
+        response = self.send(
+            'post', reverse('api:posts'), {'text': 'Новый', 'group': 'group'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['group'], 'group')
+        self.assertTrue(Post.objects.filter(
+            text='Новый', author=self.reader, group=self.group
+        ).exists())
+        response = self.send('post', reverse('api:posts'), {'text': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('text', response.json()['errors'])
+
+    def test_write_requires_login(self):
+        """Проверка ответа 401 на запись без входа"""
+        self.client.logout()
+        response = self.send('post', reverse('api:posts'), {'text': 'Новый'})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.get(reverse('api:follow_feed'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_edit_and_delete_only_by_author(self):
+        """Проверка правки и удаления поста только автором"""
+        url = reverse('api:post', args=(self.posts[1].pk,))
+        self.assertEqual(
+            self.send('patch', url, {'text': 'Чужой'}).status_code, 403
+        )
+        self.assertEqual(self.client.delete(url).status_code, 403)
+        self.client.force_login(self.author)
+        response = self.send('patch', url, {'text': 'Правка'})
+        self.assertEqual(response.json()['text'], 'Правка')
+        self.assertEqual(response.json()['group'], 'group')
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_form_body_only_for_post(self):
+        """Проверка ответа 415 на форму в PATCH"""
+        self.client.force_login(self.author)
+        url = reverse('api:post', args=(self.posts[1].pk,))
+        response = self.client.patch(
+            url, 'text=changed',
+            content_type='application/x-www-form-urlencoded',
+        )
+        self.assertEqual(response.status_code, 415)
+        self.assertNotEqual(self.client.get(url).json()['text'], 'changed')
+
+    def test_comments(self):
+        """Проверка списка и добавления комментариев"""
+        url = reverse('api:post_comments', args=(self.posts[0].pk,))
+        response = self.send('post', url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['author'], 'reader')
+        self.assertEqual(
+            self.client.get(url).json()['results'][0]['text'], 'Комментарий'
+        )
+        self.assertEqual(Comment.objects.count(), 1)
+        missing = reverse('api:post_comments', args=(self.posts[-1].pk + 1,))
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_groups_and_users(self):
+        """Проверка групп и профиля пользователя"""
+        response = self.client.get(reverse('api:groups')).json()
+        self.assertEqual(response['results'][0]['slug'], 'group')
+        response = self.client.get(reverse('api:user', args=('author',)))
+        self.assertEqual(response.json()['post_count'], 5)
+        response = self.client.get(reverse('api:user', args=('nobody',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_follow_and_feed(self):
+        """Проверка подписки, ленты подписок и отписки"""
+        response = self.send('post', reverse('api:follows'), {
+            'author': 'author'
+        })
+        self.assertEqual(response.status_code, 201)
+        feed = self.client.get(
+            reverse('api:follow_feed'), {'fields': 'id'}
+        ).json()
+        self.assertEqual(
+            [post['id'] for post in feed['results']],
+            [post.pk for post in reversed(self.posts)],
+        )
+        follows = self.client.get(reverse('api:follows')).json()
+        self.assertEqual(follows['results'][0]['author'], 'author')
+        url = reverse('api:unfollow', args=('author',))
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(self.client.delete(url).status_code, 404)
+
+    def test_method_not_allowed(self):
+        """Проверка ответа 405 с заголовком Allow"""
+        response = self.client.delete(reverse('api:posts'))
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, HEAD, POST')
+
+
+class FollowBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader')
+        UserStats.objects.create(user=cls.user)
+        cls.authors = [
+            User.objects.create_user(username=f'author{number}')
+            for number in range(6)
+        ]
+        for author in cls.authors:
+            Post.objects.create(text='Пост', author=author)
+        cls.url = reverse('api:follows_batch')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def send(self, data):
+        return self.client.post(
+            self.url, json.dumps(data), content_type='application/json'
+        )
+
+    def test_follow_and_unfollow(self):
+        """Проверка массовой подписки и отписки"""
+        Follow.objects.create(user=self.user, author=self.authors[0])
+        response = self.send({
+            'follow': ['author0', 'author1', 'author2', 'nobody', 'reader'],
+        }).json()
+        self.assertEqual(response, {
+            'followed': ['author1', 'author2'],
+            'unfollowed': [],
+            'not_found': ['nobody'],
+        })
+        self.assertEqual(
+            UserStats.objects.get(user=self.user).following_count, 3
+        )
+        self.assertEqual(
+            UserStats.objects.get(user=self.authors[1]).follower_count, 1
+        )
+        self.assertEqual(self.user.timeline.count(), 3)
+        response = self.send({'unfollow': ['author0', 'author3']}).json()
+        self.assertEqual(response['unfollowed'], ['author0'])
+        self.assertEqual(
+            set(Follow.objects.values_list('author__username', flat=True)),
+            {'author1', 'author2'},
+        )
+        self.assertEqual(self.user.timeline.count(), 2)
+        self.assertEqual(
+            UserStats.objects.get(user=self.authors[0]).follower_count, 0
+        )
+
+    def test_query_count_does_not_grow(self):
+        """Проверка числа запросов, не зависящего от размера пачки"""
+        names = [author.username for author in self.authors]
+        with CaptureQueriesContext(connection) as small:
+            self.send({'follow': names[:2]})
+        with CaptureQueriesContext(connection) as large:
+            self.send({'follow': names[2:]})
+        self.assertEqual(len(small), len(large))
+        with CaptureQueriesContext(connection) as small:
+            self.send({'unfollow': names[:2]})
+        with CaptureQueriesContext(connection) as large:
+            self.send({'unfollow': names[2:]})
+        self.assertEqual(len(small), len(large))
+
+    def test_invalid_body(self):
+        """Проверка ответа 400 на некорректное тело запроса"""
+        for data in (
+            {'follow': 'author0'},
+            {'follow': ['author0'], 'unfollow': ['author0']},
+            {'follow': ['author'] * 101},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self.send(data).status_code, 400)
@@ -0,0 +1,21 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.posts, name='posts'),
+    path('posts/<int:post_id>/', views.post, name='post'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments, name='post_comments'
+    ),
+    path('groups/', views.groups, name='groups'),
+    path('groups/<slug:slug>/', views.group, name='group'),
+    path('users/<str:username>/', views.user, name='user'),
+    path('follow/', views.follow_feed, name='follow_feed'),
+    path('follows/', views.follows, name='follows'),
+    path('batch/follows/', views.follows_batch, name='follows_batch'),
+    path('follows/<str:username>/', views.unfollow, name='unfollow'),
+]
@@ -0,0 +1,282 @@
+"""JSON API постов, групп, комментариев и подписок.
+
+Списки листаются курсором (``?cursor=``, ``?limit=``), набор полей ответа
+задаёт ``?fields=``. Запись идёт от имени пользователя сессии с обычной
+проверкой CSRF; тело запроса — JSON, а для POST ещё и форма (для
+загрузки картинки): форму Django разбирает только в POST.
+"""
+import json
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+
+from posts import follows as follow_batch
+from posts import queries
+from posts.forms import CommentForm
+from posts.models import Comment, Follow, Group, Post, TimelineEntry
+from posts.paginator import CursorPaginator
+
+from . import projections
+from .forms import PostForm
+
+User = get_user_model()
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+FOLLOW_BATCH_SIZE = 100
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class ApiError(Exception):
+    def __init__(self, status, detail, **extra):
+        super().__init__(detail)
+        self.status = status
+        self.payload = {'detail': detail, **extra}
+
+
+def api_view(*methods, login_required=False):
+    """Разрешённые методы, ответы об ошибках в JSON и проверка входа.
+
+    Изменяющие методы всегда требуют входа, ``login_required`` —
+    и для чтения.
+    """
+    allowed = set(methods)
+    if 'GET' in allowed:
+        allowed.add('HEAD')
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in allowed:
+                    raise ApiError(405, 'Метод не поддерживается')
+                if not request.user.is_authenticated and (
+                    login_required or request.method not in SAFE_METHODS
+                ):
+                    raise ApiError(401, 'Требуется вход')
+                return view(request, *args, **kwargs)
+            except Http404:
+                return JsonResponse({'detail': 'Не найдено'}, status=404)
+            except ApiError as error:
+                response = JsonResponse(error.payload, status=error.status)
+                if error.status == 405:
+                    response['Allow'] = ', '.join(sorted(allowed))
+                return response
+        return wrapper
+    return decorator
+
+
+def _data(request):
+    if request.content_type != 'application/json':
+        if request.method != 'POST':
+            # request.POST пуст для других методов: данные бы потерялись.
+            raise ApiError(415, 'Ожидается JSON')
+        return request.POST
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        raise ApiError(400, 'Некорректный JSON')
+    if not isinstance(data, dict):
+        raise ApiError(400, 'Ожидается JSON-объект')
+    return data
+
+
+def _validate(form):
+    if not form.is_valid():
+        raise ApiError(400, 'Некорректные данные', errors=form.errors)
+    return form
+
+
+def _fields(request, projection):
+    try:
+        return projection.select(request.GET.get('fields'))
+    except ValueError as error:
+        raise ApiError(400, f'Неизвестные поля: {error}')
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, 'limit должен быть числом')
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def _list(request, queryset, projection, ordering=('-pub_date', '-id')):
+    """Страница списка одним запросом по ``values()``.
+
+    Поля ключа курсора выбираются всегда, даже если их нет в ``fields``.
+    """
+    names = _fields(request, projection)
+    rows = projection.values(
+        queryset, names, (key.lstrip('-') for key in ordering)
+    )
+    paginator = CursorPaginator(rows, _limit(request), ordering)
+    page = paginator.get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [projection.row(row, names) for row in page],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
+
+
+def _detail(request, queryset, projection, status=200):
+    names = _fields(request, projection)
+    row = projection.values(queryset, names).first()
+    if row is None:
+        raise Http404
+    return JsonResponse(projection.row(row, names), status=status)
+
+
+def _own_post(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related('group'), pk=post_id
+    )
+    if post.author_id != request.user.pk:
+        raise ApiError(403, 'Изменять пост может только автор')
+    return post
+
+
+@api_view('GET', 'POST')
+def posts(request):
+    if request.method == 'POST':
+        form = _validate(PostForm(_data(request), request.FILES or None))
+        post = form.save(commit=False)
+        post.author = request.user
+        post.save()
+        return _detail(
+            request, Post.objects.filter(pk=post.pk), projections.POSTS, 201
+        )
+    post_list = Post.objects.all()
+    if request.GET.get('group'):
+        post_list = post_list.filter(group__slug=request.GET['group'])
+    if request.GET.get('author'):
+        post_list = post_list.filter(author__username=request.GET['author'])
+    return _list(request, post_list, projections.POSTS)
+
+
+@api_view('GET', 'PATCH', 'DELETE')
+def post(request, post_id):
+    if request.method == 'DELETE':
+        _own_post(request, post_id).delete()
+        return HttpResponse(status=204)
+    if request.method == 'PATCH':
+        instance = _own_post(request, post_id)
+        data = {
+            'text': instance.text,
+            'group': instance.group.slug if instance.group else None,
+        }
+        data.update(_data(request))
+        _validate(PostForm(data, instance=instance)).save()
+    return _detail(
+        request, Post.objects.filter(pk=post_id), projections.POSTS
+    )
+
+
+@api_view('GET', 'POST')
+def post_comments(request, post_id):
+    if request.method == 'POST':
+        post_id = get_object_or_404(Post, pk=post_id).pk
+        comment = _validate(CommentForm(_data(request))).save(commit=False)
+        comment.author = request.user
+        comment.post_id = post_id
+        comment.save()
+        return _detail(
+            request, Comment.objects.filter(pk=comment.pk),
+            projections.COMMENTS, 201,
+        )
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
+    return _list(
+        request, Comment.objects.filter(post_id=post_id),
+        projections.COMMENTS, queries.COMMENT_ORDERING,
+    )
+
+
+@api_view('GET')
+def groups(request):
+    return _list(request, Group.objects.all(), projections.GROUPS, ('slug',))
+
+
+@api_view('GET')
+def group(request, slug):
+    return _detail(
+        request, Group.objects.filter(slug=slug), projections.GROUPS
+    )
+
+
+@api_view('GET')
+def user(request, username):
+    return _detail(
+        request, User.objects.filter(username=username), projections.USERS
+    )
+
+
+@api_view('GET', login_required=True)
+def follow_feed(request):
+    return _list(
+        request, TimelineEntry.objects.filter(user=request.user),
+        projections.TIMELINE, ('-pub_date', '-post_id'),
+    )
+
+
+@api_view('GET', 'POST', login_required=True)
+def follows(request):
+    if request.method == 'POST':
+        username = _data(request).get('author')
+        if not username:
+            raise ApiError(400, 'Не указан автор')
+        author = get_object_or_404(User, username=username)
+        if author.pk == request.user.pk:
+            raise ApiError(400, 'Нельзя подписаться на себя')
+        follow, created = Follow.objects.get_or_create(
+            user=request.user, author=author
+        )
+        return _detail(
+            request, Follow.objects.filter(pk=follow.pk),
+            projections.FOLLOWS, 201 if created else 200,
+        )
+    return _list(
+        request, Follow.objects.filter(user=request.user),
+        projections.FOLLOWS, ('-id',),
+    )
+
+
+@api_view('DELETE')
+def unfollow(request, username):
+    deleted, _ = Follow.objects.filter(
+        user=request.user, author__username=username
+    ).delete()
+    if not deleted:
+        raise Http404
+    return HttpResponse(status=204)
+
+
+def _usernames(data, key):
+    names = data.get(key) or []
+    if not isinstance(names, list) or not all(
+        isinstance(name, str) for name in names
+    ):
+        raise ApiError(400, f'{key} должен быть списком имён')
+    return names
+
+
+@api_view('POST')
+def follows_batch(request):
+    """Подписка и отписка от многих авторов одним запросом.
+
+    Тело: ``{"follow": [имена], "unfollow": [имена]}``.
+    """
+    data = _data(request)
+    follow = _usernames(data, 'follow')
+    unfollow = _usernames(data, 'unfollow')
+    if len(follow) + len(unfollow) > FOLLOW_BATCH_SIZE:
+        raise ApiError(
+            400, f'Не больше {FOLLOW_BATCH_SIZE} имён за запрос'
+        )
+    if set(follow) & set(unfollow):
+        raise ApiError(400, 'Имя указано и в follow, и в unfollow')
+    return JsonResponse(follow_batch.apply(request.user, follow, unfollow))
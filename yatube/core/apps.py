@@ -1,5 +1,20 @@
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .checks import production_settings
+        from .sqlite import configure_connection
+
+        connection_created.connect(configure_connection)
+        # В бою не запускаемся с отладочными настройками вовсе,
+        # а не только предупреждаем в manage.py check.
+        errors = production_settings()
+        if errors:
+            raise ImproperlyConfigured(
+                '\n'.join(str(error) for error in errors)
+            )
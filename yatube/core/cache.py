@@ -0,0 +1,293 @@
+"""Кеш в файле SQLite, общий для всех процессов сервера на одной машине.
+
+В отличие от ``LocMemCache`` запись и сброс версий лент видят все
+воркеры, а внешний сервис не нужен. Файл открывается в режиме WAL
+с отображением в память: чтения идут параллельно и не ждут писателя.
+
+Каждая операция — одна инструкция SQL или одна транзакция, поэтому
+``set``, ``add`` и ``incr`` атомарны между процессами. Целые числа
+хранятся как INTEGER и увеличиваются прямо в базе, остальные значения
+сериализуются pickle. Число записей и их общий размер поддерживают
+триггеры; при превышении ``MAX_ENTRIES`` или ``MAX_SIZE`` удаляются
+просроченные записи, затем давно не читанные (LRU). Время чтения
+обновляется не чаще раза в ``ACCESS_RESOLUTION`` секунд, чтобы чтения
+не превращались в записи.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.SQLiteCache',
+            'LOCATION': '/var/tmp/yatube-cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 10000, 'MAX_SIZE': 64 * 1024 ** 2},
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .sqlite import apply_pragmas
+
+CACHE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 64 * 1024 * 1024,
+}
+ACCESS_RESOLUTION = 60
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    ' key TEXT PRIMARY KEY,'
+    ' value BLOB,'
+    ' expires REAL,'
+    ' accessed REAL NOT NULL,'
+    ' size INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS cache_meta ('
+    ' id INTEGER PRIMARY KEY CHECK (id = 1),'
+    ' entries INTEGER NOT NULL,'
+    ' size INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO cache_meta VALUES (1, 0, 0)',
+    'CREATE TRIGGER IF NOT EXISTS cache_inserted AFTER INSERT ON cache '
+    'BEGIN UPDATE cache_meta SET entries = entries + 1,'
+    ' size = size + NEW.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_deleted AFTER DELETE ON cache '
+    'BEGIN UPDATE cache_meta SET entries = entries - 1,'
+    ' size = size - OLD.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_updated AFTER UPDATE OF size ON cache '
+    'BEGIN UPDATE cache_meta SET size = size - OLD.size + NEW.size; END',
+)
+
+UPSERT = (
+    'INSERT INTO cache (key, value, expires, accessed, size) '
+    'VALUES (?, ?, ?, ?, ?) '
+    'ON CONFLICT (key) DO UPDATE SET value = excluded.value,'
+    ' expires = excluded.expires, accessed = excluded.accessed,'
+    ' size = excluded.size'
+)
+ALIVE = '(expires IS NULL OR expires > ?)'
+
+
+@contextmanager
+def _transaction(connection):
+    """Транзакция, сразу берущая блокировку записи.
+
+    Так читающая транзакция не становится пишущей посередине
+    и не получает SQLITE_BUSY в обход ``busy_timeout``.
+    """
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.max_size = options.get('MAX_SIZE')
+        self.pragmas = options.get('PRAGMAS', CACHE_PRAGMAS)
+        self._local = threading.local()
+
+    @property
+    def _connection(self):
+        """Соединение текущего потока; после fork открывается заново."""
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            apply_pragmas(connection.cursor(), self.pragmas)
+            for statement in SCHEMA:
+                connection.execute(statement)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _expires(self, timeout):
+        return self.get_backend_timeout(timeout)
+
+    @staticmethod
+    def _encode(value):
+        # bool — подкласс int, но инкрементировать его нельзя.
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        return value if isinstance(value, int) else pickle.loads(value)
+
+    @staticmethod
+    def _size(key, value):
+        return len(key) + (8 if isinstance(value, int) else len(value))
+
+    def _write(self, key, value, timeout, add=False):
+        value = self._encode(value)
+        now = time.time()
+        row = (key, value, self._expires(timeout), now, self._size(key, value))
+        connection = self._connection
+        with _transaction(connection):
+            if add:
+                # В DO UPDATE столбцы без префикса — у существующей записи.
+                cursor = connection.execute(
+                    f'{UPSERT} WHERE NOT {ALIVE}', (*row, now)
+                )
+            else:
+                cursor = connection.execute(UPSERT, row)
+            written = cursor.rowcount > 0
+            if written:
+                self._cull(connection, now)
+        return written
+
+    def _cull(self, connection, now):
+        entries, size = connection.execute(
+            'SELECT entries, size FROM cache_meta'
+        ).fetchone()
+        if entries <= self._max_entries and (
+            self.max_size is None or size <= self.max_size
+        ):
+            return
+        connection.execute(f'DELETE FROM cache WHERE NOT {ALIVE}', (now,))
+        while True:
+            entries, size = connection.execute(
+                'SELECT entries, size FROM cache_meta'
+            ).fetchone()
+            over_size = self.max_size is not None and size > self.max_size
+            if entries <= self._max_entries and not over_size:
+                return
+            if self._cull_frequency == 0:
+                connection.execute('DELETE FROM cache')
+                return
+            connection.execute(
+                'DELETE FROM cache WHERE key IN ('
+                ' SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+                (max(entries // self._cull_frequency, 1),),
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._write(self._key(key, version), value, timeout, add=True)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._write(self._key(key, version), value, timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        row = self._connection.execute(
+            f'SELECT value, accessed FROM cache WHERE key = ? AND {ALIVE}',
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return default
+        if now - row[1] > ACCESS_RESOLUTION:
+            self._mark_accessed([key], now)
+        return self._decode(row[0])
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        if not keys:
+            return {}
+        now = time.time()
+        placeholders = ', '.join('?' * len(keys))
+        rows = self._connection.execute(
+            f'SELECT key, value, accessed FROM cache '
+            f'WHERE key IN ({placeholders}) AND {ALIVE}',
+            (*keys, now),
+        ).fetchall()
+        stale = [key for key, _, accessed in rows
+                 if now - accessed > ACCESS_RESOLUTION]
+        if stale:
+            self._mark_accessed(stale, now)
+        return {keys[key]: self._decode(value) for key, value, _ in rows}
+
+    def _mark_accessed(self, keys, now):
+        placeholders = ', '.join('?' * len(keys))
+        self._connection.execute(
+            f'UPDATE cache SET accessed = ? WHERE key IN ({placeholders})',
+            (now, *keys),
+        )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        expires = self._expires(timeout)
+        rows = []
+        for key, value in data.items():
+            key = self._key(key, version)
+            value = self._encode(value)
+            rows.append((key, value, expires, now, self._size(key, value)))
+        connection = self._connection
+        with _transaction(connection):
+            connection.executemany(UPSERT, rows)
+            self._cull(connection, now)
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        cursor = self._connection.execute(
+            f'UPDATE cache SET expires = ? WHERE key = ? AND {ALIVE}',
+            (self._expires(timeout), self._key(key, version), now),
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        """Атомарное увеличение числа прямо в базе."""
+        key = self._key(key, version)
+        connection = self._connection
+        with _transaction(connection):
+            row = connection.execute(
+                f'SELECT value FROM cache WHERE key = ? AND {ALIVE}',
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            if isinstance(row[0], int):
+                connection.execute(
+                    'UPDATE cache SET value = value + ? WHERE key = ?',
+                    (delta, key),
+                )
+                return row[0] + delta
+            # Не целое число хранится в pickle: складываем в Python.
+            value = self._decode(row[0]) + delta
+            encoded = self._encode(value)
+            connection.execute(
+                'UPDATE cache SET value = ?, size = ? WHERE key = ?',
+                (encoded, self._size(key, encoded), key),
+            )
+        return value
+
+    def delete(self, key, version=None):
+        self._connection.execute(
+            'DELETE FROM cache WHERE key = ?', (self._key(key, version),)
+        )
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        if keys:
+            placeholders = ', '.join('?' * len(keys))
+            self._connection.execute(
+                f'DELETE FROM cache WHERE key IN ({placeholders})', keys
+            )
+
+    def has_key(self, key, version=None):
+        return self._connection.execute(
+            f'SELECT 1 FROM cache WHERE key = ? AND {ALIVE}',
+            (self._key(key, version), time.time()),
+        ).fetchone() is not None
+
+    def clear(self):
+        self._connection.execute('DELETE FROM cache')
@@ -0,0 +1,91 @@
+"""Проверки настроек боевого профиля.
+
+Отладочные настройки в бою замедляют каждый запрос: DEBUG копит все
+запросы SQL в ``connection.queries``, некешированный загрузчик читает
+и разбирает шаблоны заново, соединение с базой открывается на каждый
+запрос. Проверки выполняет команда ``check``, а при ``PRODUCTION = True``
+процесс с такими настройками не запускается, см. ``CoreConfig.ready``.
+"""
+from django.conf import settings
+from django.core import checks
+
+DJANGO_TEMPLATES = 'django.template.backends.django.DjangoTemplates'
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+PROCESS_CACHES = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+DEBUG_APPS = ('debug_toolbar', 'silk')
+
+
+def _loader_name(loader):
+    return loader if isinstance(loader, str) else loader[0]
+
+
+def _templates():
+    for template in settings.TEMPLATES:
+        if template['BACKEND'] != DJANGO_TEMPLATES:
+            continue
+        options = template.get('OPTIONS', {})
+        if options.get('debug', settings.DEBUG):
+            yield checks.Error(
+                'Шаблоны собираются в режиме отладки.',
+                hint="Уберите OPTIONS['debug'].", id='core.E002',
+            )
+        loaders = options.get('loaders')
+        if loaders is not None and not any(
+            _loader_name(loader) == CACHED_LOADER for loader in loaders
+        ):
+            yield checks.Error(
+                'Загрузчик шаблонов без кеша разбирает их на каждый запрос.',
+                hint=f'Оберните загрузчики в {CACHED_LOADER}.',
+                id='core.E003',
+            )
+
+
+def _databases():
+    for alias, database in settings.DATABASES.items():
+        if database.get('CONN_MAX_AGE', 0) == 0:
+            yield checks.Error(
+                f'База {alias}: соединение закрывается после каждого '
+                f'запроса.',
+                hint='Задайте CONN_MAX_AGE или YATUBE_CONN_MAX_AGE.',
+                id='core.E004',
+            )
+
+
+def _caches():
+    for alias, cache in settings.CACHES.items():
+        if cache['BACKEND'] in PROCESS_CACHES:
+            yield checks.Error(
+                f'Кеш {alias} не общий для воркеров: {cache["BACKEND"]}.',
+                hint='Используйте core.cache.SQLiteCache.', id='core.E005',
+            )
+
+
+@checks.register()
+def production_settings(app_configs=None, **kwargs):
+    """Ошибки в настройках боевого профиля."""
+    if not getattr(settings, 'PRODUCTION', False):
+        return []
+    errors = []
+    if settings.DEBUG:
+        errors.append(checks.Error(
+            'DEBUG включён: каждый запрос SQL сохраняется в памяти.',
+            id='core.E001',
+        ))
+    errors.extend(_templates())
+    errors.extend(_databases())
+    errors.extend(_caches())
+    if getattr(settings, 'SERVE_MEDIA', False):
+        errors.append(checks.Error(
+            'Файлы /media/ раздаёт Django.',
+            hint='Раздавайте их веб-сервером.', id='core.E006',
+        ))
+    errors.extend(
+        checks.Error(
+            f'Отладочное приложение {app} в INSTALLED_APPS.', id='core.E007',
+        )
+        for app in DEBUG_APPS if app in settings.INSTALLED_APPS
+    )
+    return errors
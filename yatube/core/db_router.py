@@ -0,0 +1,72 @@
+"""Чтение с реплик базы данных.
+
+Реплики — псевдонимы из ``settings.DATABASE_REPLICAS``. На реплику
+уходят только чтения внутри GET- и HEAD-запросов, которые размечает
+``ReplicaRoutingMiddleware``; команды, фоновые задачи и транзакции
+работают с основной базой. Первая запись в запросе переключает
+оставшиеся чтения на основную базу, а middleware ставит cookie, чтобы
+и следующие запросы пользователя какое-то время видели свои изменения.
+
+Cookie защищает только автора записи. Кеш, сброшенный записью, другой
+пользователь заполнил бы с отстающей реплики, и устаревшие данные жили
+бы до конца таймаута кеша. Поэтому кеши подписок и комментариев
+заполняются чтением с основной базы, а фрагмент ленты, изменённой
+меньше ``REPLICA_PIN_SECONDS`` назад, запрос с реплики не кеширует
+(см. ``posts.feed_cache``).
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Сессии читаются с основной базы: сессия, не найденная на отстающей
+# реплике, считается пустой, и SessionMiddleware удаляет её cookie.
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_state = threading.local()
+
+
+def start_request(use_replica):
+    """Выбирает реплику на время запроса; одна на весь запрос."""
+    replicas = settings.DATABASE_REPLICAS
+    _state.replica = (
+        random.choice(replicas) if use_replica and replicas else None
+    )
+    _state.wrote = False
+
+
+def reads_replica():
+    """Читает ли текущий запрос с реплики."""
+    return getattr(_state, 'replica', None) is not None
+
+
+def finish_request():
+    """Сбрасывает состояние; возвращает True, если в запросе была запись."""
+    wrote = getattr(_state, 'wrote', False)
+    _state.replica = None
+    _state.wrote = False
+    return wrote
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if replica is None or (
+            model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        _state.replica = None
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
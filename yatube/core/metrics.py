@@ -0,0 +1,218 @@
+"""Замеры обработки запросов: SQL, шаблоны, кэш и общее время.
+
+Замер текущего запроса хранится в ``threading.local``. Шаблоны
+и кэш инструментируются один раз при создании middleware: обёртки
+ничего не делают, если запрос не замеряется. Сводные гистограммы
+живут в памяти процесса, у каждого воркера они свои.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template.base import Template
+
+# Верхние границы корзин гистограмм, мс.
+BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+HISTOGRAMS = ('total', 'db', 'template')
+# Запросы к самой сводке в неё не попадают.
+METRICS_VIEW_NAME = 'metrics'
+
+_state = threading.local()
+_lock = threading.Lock()
+_metrics = {}
+_installed = False
+_MISSING = object()
+
+
+class Measurement:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Вложенные вызовы (get_many через get) не учитываются дважды.
+        self.cache_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка ``connection.execute_wrapper`` для учёта SQL."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        """Значение заголовка ``Server-Timing``."""
+        return ', '.join((
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} SQL"',
+            f'tpl;dur={self.template * 1000:.1f}',
+            f'cache;desc="{self.cache_hits} hit {self.cache_misses} miss"',
+            f'total;dur={self.total * 1000:.1f}',
+        ))
+
+
+def current():
+    return getattr(_state, 'measurement', None)
+
+
+def measure(get_response, request):
+    """Выполняет запрос, замеряя его; возвращает (ответ, замер)."""
+    measurement = Measurement()
+    _state.measurement = measurement
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(measurement))
+            response = get_response(request)
+    finally:
+        _state.measurement = None
+        measurement.total = time.perf_counter() - measurement.started
+    return response, measurement
+
+
+def _instrument_template_render(render):
+    @wraps(render)
+    def wrapper(self, context):
+        measurement = current()
+        if measurement is None or measurement.template_depth:
+            return render(self, context)
+        measurement.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            measurement.template += time.perf_counter() - started
+            measurement.template_depth -= 1
+    return wrapper
+
+
+def _count_cache(measurement, hits, misses):
+    measurement.cache_hits += hits
+    measurement.cache_misses += misses
+
+
+def _instrument_cache_get(get):
+    @wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        measurement = current()
+        if measurement is None or measurement.cache_depth:
+            return get(self, key, default, version)
+        measurement.cache_depth += 1
+        try:
+            value = get(self, key, _MISSING, version)
+        finally:
+            measurement.cache_depth -= 1
+        if value is _MISSING:
+            _count_cache(measurement, 0, 1)
+            return default
+        _count_cache(measurement, 1, 0)
+        return value
+    return wrapper
+
+
+def _instrument_cache_get_many(get_many):
+    @wraps(get_many)
+    def wrapper(self, keys, version=None):
+        measurement = current()
+        if measurement is None or measurement.cache_depth:
+            return get_many(self, keys, version)
+        keys = list(keys)
+        measurement.cache_depth += 1
+        try:
+            found = get_many(self, keys, version)
+        finally:
+            measurement.cache_depth -= 1
+        _count_cache(measurement, len(found), len(keys) - len(found))
+        return found
+    return wrapper
+
+
+def install():
+    """Оборачивает рендер шаблонов и чтение из настроенных кэшей."""
+    global _installed
+    with _lock:
+        if _installed:
+            return
+        Template.render = _instrument_template_render(Template.render)
+        backends = {type(caches[alias]) for alias in settings.CACHES}
+        for backend in backends:
+            backend.get = _instrument_cache_get(backend.get)
+            backend.get_many = _instrument_cache_get_many(backend.get_many)
+        _installed = True
+
+
+def _empty_histogram():
+    return {'buckets': [0] * (len(BUCKETS) + 1), 'count': 0, 'sum': 0.0}
+
+
+def _observe(histogram, value):
+    histogram['buckets'][bisect_left(BUCKETS, value)] += 1
+    histogram['count'] += 1
+    histogram['sum'] += value
+
+
+def record(view_name, measurement):
+    """Добавляет замер запроса в сводку по представлению."""
+    values = {
+        'total': measurement.total * 1000,
+        'db': measurement.db * 1000,
+        'template': measurement.template * 1000,
+    }
+    with _lock:
+        metrics = _metrics.get(view_name)
+        if metrics is None:
+            metrics = _metrics[view_name] = {
+                'requests': 0,
+                'queries': 0,
+                'cache_hits': 0,
+                'cache_misses': 0,
+                **{name: _empty_histogram() for name in HISTOGRAMS},
+            }
+        metrics['requests'] += 1
+        metrics['queries'] += measurement.queries
+        metrics['cache_hits'] += measurement.cache_hits
+        metrics['cache_misses'] += measurement.cache_misses
+        for name, value in values.items():
+            _observe(metrics[name], value)
+
+
+def _export_histogram(histogram):
+    """Накопительные корзины, как в формате Prometheus."""
+    buckets = {}
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ('+Inf',), histogram['buckets']):
+        cumulative += count
+        buckets[str(bound)] = cumulative
+    return {
+        'buckets_ms': buckets,
+        'count': histogram['count'],
+        'sum_ms': round(histogram['sum'], 3),
+    }
+
+
+def snapshot():
+    with _lock:
+        return {
+            view_name: {
+                key: (
+                    _export_histogram(value) if key in HISTOGRAMS else value
+                )
+                for key, value in metrics.items()
+            }
+            for view_name, metrics in sorted(_metrics.items())
+        }
+
+
+def reset():
+    with _lock:
+        _metrics.clear()
@@ -0,0 +1,55 @@
+from django.conf import settings
+
+from . import db_router, metrics
+
+
+class RequestMetricsMiddleware:
+    """Замеряет запрос, добавляет ``Server-Timing`` и копит сводку.
+
+    Ставится первой в ``MIDDLEWARE``, чтобы общее время включало
+    остальные middleware. Запросы без сопоставленного представления
+    попадают в сводку под именем ``<unresolved>``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        metrics.install()
+
+    def __call__(self, request):
+        response, measurement = metrics.measure(self.get_response, request)
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else '<unresolved>'
+        if view_name != metrics.METRICS_VIEW_NAME:
+            metrics.record(view_name, measurement)
+        response['Server-Timing'] = measurement.server_timing()
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет чтения GET- и HEAD-запросов на реплики.
+
+    После запроса с записью ставит cookie ``REPLICA_PIN_COOKIE``: пока
+    она жива, запросы пользователя читают из основной базы и видят
+    собственные изменения, даже если реплики ещё отстают.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica = request.method in ('GET', 'HEAD') and (
+            settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        )
+        db_router.start_request(use_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = db_router.finish_request()
+        if wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
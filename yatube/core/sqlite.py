@@ -0,0 +1,22 @@
+"""Настройка соединений SQLite.
+
+При каждом новом соединении выполняются PRAGMA из
+``settings.SQLITE_PRAGMAS``. WAL позволяет читать параллельно с записью,
+``busy_timeout`` заставляет писателя ждать блокировку, а не сразу падать
+с «database is locked», ``synchronous = NORMAL`` в режиме WAL
+синхронизирует диск только при контрольных точках.
+"""
+from django.conf import settings
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Обработчик сигнала ``connection_created``."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, settings.SQLITE_PRAGMAS)
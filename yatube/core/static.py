@@ -0,0 +1,154 @@
+"""Раздача статики и медиа на уровне WSGI, до Django.
+
+Запрос к ``STATIC_URL`` или ``MEDIA_URL`` с существующим файлом не
+доходит до middleware и представлений: заголовки считаются по ``stat``,
+а тело отдаётся через ``wsgi.file_wrapper`` — gunicorn и uWSGI
+передают файл в сокет через ``sendfile`` без копирования в Python.
+Если клиент принимает br или gzip и рядом лежит сжатая копия (см.
+``core.storage``), отдаётся она. Имена из манифеста ``collectstatic``
+содержат хеш и получают вечный ``Cache-Control: immutable``; остальные
+файлы кешируются на ``STATIC_CACHE_MAX_AGE``/``MEDIA_CACHE_MAX_AGE``
+и проверяются по ETag. Файла нет — запрос уходит в приложение.
+"""
+import json
+import mimetypes
+import os
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.utils.http import http_date, parse_http_date_safe
+
+BLOCK_SIZE = 64 * 1024
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+mimetypes.add_type('image/webp', '.webp')
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        if params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00'):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class FileRoute:
+    """Префикс адреса, каталог с файлами и правила кеширования."""
+
+    def __init__(self, prefix, root, max_age, immutable=()):
+        self.prefix = prefix
+        self.root = os.path.realpath(root)
+        self.max_age = max_age
+        self.immutable = frozenset(immutable)
+
+    def resolve(self, path_info):
+        """(имя, путь) файла по адресу или None."""
+        if not path_info.startswith(self.prefix):
+            return None
+        name = path_info[len(self.prefix):]
+        path = os.path.realpath(os.path.join(self.root, name))
+        # realpath раскрывает «..» и ссылки: наружу каталога не выходим.
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(
+            path
+        ):
+            return None
+        return name, path
+
+    def cache_control(self, name):
+        if name in self.immutable:
+            return IMMUTABLE
+        return f'public, max-age={self.max_age}'
+
+
+def _manifest_names(root):
+    """Имена с хешем из манифеста ``collectstatic``."""
+    try:
+        with open(os.path.join(root, 'staticfiles.json')) as manifest:
+            return set(json.load(manifest).get('paths', {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
+def routes_from_settings():
+    routes = []
+    if settings.STATIC_ROOT:
+        routes.append(FileRoute(
+            settings.STATIC_URL, settings.STATIC_ROOT,
+            settings.STATIC_CACHE_MAX_AGE,
+            _manifest_names(settings.STATIC_ROOT),
+        ))
+    if settings.MEDIA_ROOT:
+        routes.append(FileRoute(
+            settings.MEDIA_URL, settings.MEDIA_ROOT,
+            settings.MEDIA_CACHE_MAX_AGE,
+        ))
+    return routes
+
+
+class FilesApplication:
+    """WSGI-обёртка, отдающая файлы маршрутов ``routes`` сама."""
+
+    def __init__(self, application, routes=None):
+        self.application = application
+        self.routes = routes_from_settings() if routes is None else routes
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] in ('GET', 'HEAD'):
+            # PATH_INFO в WSGI — байты UTF-8, прочитанные как latin-1.
+            path_info = environ.get('PATH_INFO', '').encode(
+                'latin-1'
+            ).decode('utf-8', 'replace')
+            for route in self.routes:
+                found = route.resolve(path_info)
+                if found is not None:
+                    return self.serve(environ, start_response, route, *found)
+        return self.application(environ, start_response)
+
+    def serve(self, environ, start_response, route, name, path):
+        content_type, _ = mimetypes.guess_type(name)
+        encoding, path = self.variant(environ, path)
+        stat = os.stat(path)
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}-{encoding or ""}"'
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Cache-Control', route.cache_control(name)),
+            ('ETag', etag),
+            ('Last-Modified', http_date(stat.st_mtime)),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        if self.not_modified(environ, etag, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return []
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), BLOCK_SIZE)
+
+    @staticmethod
+    def variant(environ, path):
+        """(кодировка, путь) лучшей сжатой копии, которую примет клиент."""
+        accepted = _accepted_encodings(
+            environ.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted and os.path.isfile(path + suffix):
+                return encoding, path + suffix
+        return None, path
+
+    @staticmethod
+    def not_modified(environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return etag in (
+                tag.strip() for tag in if_none_match.split(',')
+            ) or if_none_match.strip() == '*'
+        since = parse_http_date_safe(
+            environ.get('HTTP_IF_MODIFIED_SINCE', '')
+        )
+        return since is not None and int(mtime) <= since
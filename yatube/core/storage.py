@@ -0,0 +1,59 @@
+"""Хранилище статики с хешами в именах и заранее сжатыми копиями.
+
+``collectstatic`` записывает файлы с хешем содержимого в имени
+(``css/main.3f2a9c.css``) и манифест ``staticfiles.json``; такие адреса
+не меняют содержимое, и им можно отдавать вечный ``Cache-Control``.
+Рядом с текстовыми файлами кладутся ``.gz`` и, если установлен пакет
+``brotli``, ``.br``: их отдаёт ``core.static`` без сжатия на лету.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Без brotli создаются только .gz.
+    brotli = None
+
+COMPRESSIBLE = (
+    '.css', '.js', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico',
+)
+# Мелкие и плохо сжимаемые файлы выгоднее отдавать как есть.
+MIN_SIZE = 256
+MIN_RATIO = 0.95
+
+
+def compressors():
+    """Пары (суффикс файла, функция сжатия)."""
+    # mtime=0: одинаковый файл даёт одинаковый архив при каждой сборке.
+    yield '.gz', lambda data: gzip.compress(data, 9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = {*self.hashed_files, *self.hashed_files.values()}
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE):
+                self.compress(name)
+
+    def compress(self, name):
+        """Пишет сжатые копии файла; возвращает их имена."""
+        with self.open(name) as source:
+            data = source.read()
+        written = []
+        if len(data) < MIN_SIZE:
+            return written
+        for suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) > len(data) * MIN_RATIO:
+                continue
+            # _save не перезаписывает файл, а подбирает новое имя.
+            self.delete(name + suffix)
+            written.append(self._save(name + suffix, ContentFile(compressed)))
+        return written
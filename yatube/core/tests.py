@@ -0,0 +1,407 @@
+import gzip
+import importlib
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.models import Session
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings
+)
+
+from posts import feed_cache
+
+from . import metrics
+from .checks import production_settings
+from .cache import SQLiteCache
+from .db_router import ReplicaRouter
+from .middleware import ReplicaRoutingMiddleware
+from .static import IMMUTABLE, FileRoute, FilesApplication
+
+User = get_user_model()
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.client.force_login(
+            User.objects.create_user(username='staff', is_staff=True)
+        )
+
+    def test_server_timing_header(self):
+        """Проверка заголовка Server-Timing"""
+        response = self.client.get('/')
+        header = response['Server-Timing']
+        for name in ('db;', 'tpl;', 'cache;', 'total;'):
+            self.assertIn(name, header)
+
+    def test_metrics_are_aggregated_by_view(self):
+        """Проверка сводки замеров по имени представления"""
+        self.client.get('/')
+        self.client.get('/')
+        views = self.client.get('/metrics/').json()['views']
+        self.assertNotIn(metrics.METRICS_VIEW_NAME, views)
+        index = views['posts:index']
+        self.assertEqual(index['requests'], 2)
+        self.assertEqual(index['total']['count'], 2)
+        self.assertEqual(index['total']['buckets_ms']['+Inf'], 2)
+        self.assertGreater(index['queries'], 0)
+        self.assertGreater(index['cache_misses'], 0)
+
+    def test_cache_hits_are_counted(self):
+        """Проверка учёта попаданий в кэш фрагментов"""
+        self.client.get('/')
+        self.client.get('/')
+        index = self.client.get('/metrics/').json()['views']['posts:index']
+        self.assertGreater(index['cache_hits'], 0)
+
+    def test_metrics_only_for_staff_and_token(self):
+        """Проверка доступа к сводке только персоналу и по токену"""
+        self.client.logout()
+        response = self.client.get('/metrics/', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 403)
+        with override_settings(METRICS_TOKEN='secret'):
+            response = self.client.get(
+                '/metrics/', HTTP_AUTHORIZATION='Bearer wrong'
+            )
+            self.assertEqual(response.status_code, 403)
+            response = self.client.get(
+                '/metrics/', HTTP_AUTHORIZATION='Bearer secret'
+            )
+            self.assertEqual(response.status_code, 200)
+        self.client.force_login(User.objects.get(username='staff'))
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def handle(self, request, write=False):
+        """Прогоняет запрос через middleware и запоминает базу чтения."""
+        def view(request):
+            if write:
+                self.router.db_for_write(User)
+            self.read_db = self.router.db_for_read(User)
+            return HttpResponse()
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_get_reads_from_replica(self):
+        """Проверка чтения GET-запроса с реплики"""
+        response = self.handle(self.factory.get('/'))
+        self.assertEqual(self.read_db, 'replica')
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_post_reads_from_primary(self):
+        """Проверка чтения POST-запроса с основной базы"""
+        self.handle(self.factory.post('/'))
+        self.assertEqual(self.read_db, 'default')
+
+    def test_write_pins_to_primary(self):
+        """Проверка переключения на основную базу после записи"""
+        response = self.handle(self.factory.get('/'), write=True)
+        self.assertEqual(self.read_db, 'default')
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+        request = self.factory.get('/')
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = '1'
+        self.handle(request)
+        self.assertEqual(self.read_db, 'default')
+
+    def test_replica_skips_cache_of_changed_feed(self):
+        """Проверка, что чтение с реплики не кеширует изменённую ленту"""
+        def view(request):
+            request.user = AnonymousUser()
+            context = feed_cache.get_context(request, 'index')
+            self.timeout = context['cache_timeout']
+            return HttpResponse()
+        handle = ReplicaRoutingMiddleware(view)
+        handle(self.factory.get('/'))
+        self.assertEqual(self.timeout, settings.FEED_CACHE_TIMEOUT)
+        feed_cache.invalidate('index')
+        handle(self.factory.get('/'))
+        self.assertEqual(self.timeout, 0)
+        handle(self.factory.post('/'))
+        self.assertEqual(self.timeout, settings.FEED_CACHE_TIMEOUT)
+
+    def test_sessions_read_from_primary(self):
+        """Проверка чтения сессий только с основной базы"""
+        def view(request):
+            self.read_db = self.router.db_for_read(Session)
+            return HttpResponse()
+        ReplicaRoutingMiddleware(view)(self.factory.get('/'))
+        self.assertEqual(self.read_db, 'default')
+
+    def test_reads_outside_requests_use_primary(self):
+        """Проверка чтения вне запроса с основной базы"""
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+
+class SqlitePragmasTests(TestCase):
+    def test_connection_pragmas(self):
+        """Проверка PRAGMA нового соединения SQLite"""
+        # synchronous возвращается числом: 1 — NORMAL.
+        expected = {**settings.SQLITE_PRAGMAS, 'synchronous': 1}
+        with connection.cursor() as cursor:
+            for name in ('busy_timeout', 'cache_size', 'synchronous'):
+                with self.subTest(pragma=name):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(
+                        cursor.fetchone()[0], expected[name]
+                    )
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.sqlite3')
+        self.cache = self.open()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def open(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def meta(self):
+        return self.cache._connection.execute(
+            'SELECT entries, size FROM cache_meta'
+        ).fetchone()
+
+    def test_values_are_shared_between_instances(self):
+        """Проверка общих данных у кешей с одним файлом"""
+        self.cache.set('key', {'value': 1})
+        other = self.open()
+        self.assertEqual(other.get('key'), {'value': 1})
+        other.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_add_incr_and_expiry(self):
+        """Проверка add, incr и истечения срока"""
+        self.assertTrue(self.cache.add('counter', 1))
+        self.assertFalse(self.cache.add('counter', 5))
+        self.assertEqual(self.cache.incr('counter', 2), 3)
+        self.assertEqual(self.open().get('counter'), 3)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        self.cache.set('expired', 'value', -1)
+        self.assertIsNone(self.cache.get('expired'))
+        self.assertTrue(self.cache.add('expired', 'new'))
+        self.assertEqual(
+            self.cache.get_many(['counter', 'expired', 'missing']),
+            {'counter': 3, 'expired': 'new'},
+        )
+
+    def test_cull_by_entries(self):
+        """Проверка вытеснения давно не читанных записей"""
+        cache = self.open(MAX_ENTRIES=4, CULL_FREQUENCY=2)
+        for number in range(4):
+            cache.set(f'key{number}', number)
+        cache._connection.execute(
+            "UPDATE cache SET accessed = 0 WHERE key LIKE '%key0'"
+        )
+        cache.set('key4', 4)
+        self.assertIsNone(cache.get('key0'))
+        self.assertEqual(cache.get('key4'), 4)
+        entries, _ = self.meta()
+        self.assertLessEqual(entries, 4)
+
+    def test_cull_by_size(self):
+        """Проверка ограничения общего размера"""
+        cache = self.open(MAX_SIZE=10000)
+        for number in range(10):
+            cache.set(f'key{number}', 'x' * 2000)
+        entries, size = self.meta()
+        self.assertLessEqual(size, 10000)
+        self.assertEqual(
+            (entries, size),
+            cache._connection.execute(
+                'SELECT COUNT(*), SUM(size) FROM cache'
+            ).fetchone(),
+        )
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.prod = importlib.import_module('yatube.settings.prod')
+
+    def prod_settings(self, **options):
+        values = {
+            'PRODUCTION': True,
+            'DEBUG': self.prod.DEBUG,
+            'SERVE_MEDIA': self.prod.SERVE_MEDIA,
+            'TEMPLATES': self.prod.TEMPLATES,
+            'CACHES': self.prod.CACHES,
+        }
+        values.update(options)
+        return override_settings(**values)
+
+    def error_ids(self):
+        return {error.id for error in production_settings()}
+
+    def test_prod_profile(self):
+        """Проверка, что боевой профиль проходит проверку"""
+        self.assertTrue(all(
+            database['CONN_MAX_AGE'] is None
+            for database in self.prod.DATABASES.values()
+        ))
+        with self.prod_settings():
+            self.assertEqual(self.error_ids(), set())
+
+    def test_dev_profile_is_not_checked(self):
+        """Проверка, что профиль разработки не проверяется"""
+        self.assertFalse(settings.PRODUCTION)
+        self.assertEqual(production_settings(), [])
+
+    def test_debug_options_rejected(self):
+        """Проверка ошибок для отладочных настроек в бою"""
+        templates = [{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'OPTIONS': {'loaders': settings.TEMPLATE_LOADERS},
+        }]
+        caches = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        with self.prod_settings(
+            DEBUG=True, SERVE_MEDIA=True, TEMPLATES=templates, CACHES=caches
+        ):
+            self.assertEqual(self.error_ids(), {
+                'core.E001', 'core.E002', 'core.E003', 'core.E005',
+                'core.E006',
+            })
+
+    def test_startup_refused(self):
+        """Проверка отказа запуска с отладкой в бою"""
+        with self.prod_settings(DEBUG=True):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'core.E001'):
+                apps.get_app_config('core').ready()
+
+
+class StaticFilesTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'source')
+        self.static_root = os.path.join(self.directory, 'static')
+        self.media_root = os.path.join(self.directory, 'media')
+        os.makedirs(os.path.join(self.source, 'css'))
+        os.makedirs(os.path.join(self.media_root, 'posts'))
+        self.css = 'body { color: black; }\n' * 100
+        with open(os.path.join(self.source, 'css', 'main.css'), 'w') as css:
+            css.write(self.css)
+        image = os.path.join(self.media_root, 'posts', 'a.jpg')
+        with open(image, 'wb') as jpg:
+            jpg.write(b'jpeg')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def collect(self):
+        with override_settings(
+            STATIC_ROOT=self.static_root,
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder',
+            ],
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(self.static_root, 'staticfiles.json')) as f:
+            return json.load(f)['paths']['css/main.css']
+
+    def application(self):
+        routes = [
+            FileRoute('/static/', self.static_root, 60, {self.collect()}),
+            FileRoute('/media/', self.media_root, 120),
+        ]
+        return FilesApplication(lambda environ, start: ['django'], routes)
+
+    def request(self, application, path, method='get', **headers):
+        environ = getattr(RequestFactory(), method)(path, **headers).environ
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        result = application(environ, start_response)
+        body = b''.join(
+            part.encode() if isinstance(part, str) else part
+            for part in result
+        )
+        if hasattr(result, 'close'):
+            result.close()
+        return response.get('status'), response.get('headers'), body
+
+    def test_collectstatic_precompresses(self):
+        """Проверка сжатых копий файлов с хешем"""
+        hashed = self.collect()
+        self.assertNotEqual(hashed, 'css/main.css')
+        with gzip.open(os.path.join(self.static_root, hashed + '.gz')) as f:
+            self.assertEqual(f.read().decode(), self.css)
+
+    def test_hashed_static_is_immutable(self):
+        """Проверка вечного кеша и gzip для статики с хешем"""
+        application = self.application()
+        hashed = application.routes[0].immutable
+        path = '/static/' + next(iter(hashed))
+        status, headers, body = self.request(
+            application, path, HTTP_ACCEPT_ENCODING='gzip, br;q=0'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Cache-Control'], IMMUTABLE)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Type'], 'text/css')
+        self.assertEqual(gzip.decompress(body).decode(), self.css)
+        status, headers, body = self.request(application, path)
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(body.decode(), self.css)
+
+    def test_media_conditional_get(self):
+        """Проверка кеша медиа и ответа 304 по ETag"""
+        application = self.application()
+        status, headers, body = self.request(application, '/media/posts/a.jpg')
+        self.assertEqual(body, b'jpeg')
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=120')
+        status, _, body = self.request(
+            application, '/media/posts/a.jpg',
+            HTTP_IF_NONE_MATCH=headers['ETag'],
+        )
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+        status, headers, body = self.request(
+            application, '/media/posts/a.jpg', method='head'
+        )
+        self.assertEqual(headers['Content-Length'], '4')
+        self.assertEqual(body, b'')
+
+    def test_other_requests_reach_django(self):
+        """Проверка, что прочие запросы уходят в приложение"""
+        application = self.application()
+        for path in ('/media/posts/missing.jpg', '/static/css/',
+                     '/media/../source/css/main.css', '/posts/1/'):
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self.request(application, path)[2], b'django'
+                )
+        self.assertEqual(self.request(
+            application, '/media/posts/a.jpg', method='post'
+        )[2], b'django')
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from . import search
 from .models import Post, Group, Comment, Follow
 
 
@@ -15,6 +16,14 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not search.is_supported():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        queryset, _ = search.search(queryset, search_term)
+        return queryset, False
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
@@ -0,0 +1,51 @@
+"""Общие части массовой загрузки данных в обход сигналов.
+
+``bulk_create`` не отправляет сигналы, поэтому после загрузки
+производные данные — ленты подписок, счётчики и поисковый индекс —
+пересобираются целиком, а кеш лент сбрасывается.
+"""
+from contextlib import contextmanager
+from itertools import islice
+
+from . import counters, feed_cache, search, timeline
+
+
+def invalidate_feeds():
+    feed_cache.invalidate(feed_cache.ALL_FEEDS)
+
+
+DERIVED_DATA = (
+    ('Ленты подписок', timeline.rebuild),
+    ('Счётчики', counters.reconcile),
+    ('Поисковый индекс', search.rebuild),
+    ('Кеш лент', invalidate_feeds),
+)
+
+# Что пересобирать после загрузки модели; посты затрагивают всё.
+DERIVED_BY_MODEL = {
+    'groups': {invalidate_feeds},
+    'posts': {function for _, function in DERIVED_DATA},
+    'comments': {counters.reconcile, invalidate_feeds},
+    'follows': {timeline.rebuild, counters.reconcile, invalidate_feeds},
+}
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """Позволяет задать даты полей auto_now_add при bulk_create."""
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def batched(objects, size):
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,53 @@
+"""Кеш отрендеренных карточек постов.
+
+Ленты выводят посты одной карточкой ``posts/includes/post_card.html``.
+HTML карточки хранится в кеше под ключом из id поста и хеша всего, что
+в неё выводится: времени правки, имени автора и slug группы. Правка
+поста меняет ключ, поэтому удалять старые карточки не нужно. Страница
+ленты получает все карточки одним ``get_many`` и рендерит только
+недостающие. Карточка с исходной картинкой вместо ещё не построенной
+миниатюры не кешируется.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+
+from . import thumbnails
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+
+
+def _key(post, show_author):
+    parts = (
+        post.updated_at.isoformat(),
+        post.author.username,
+        post.author.get_full_name(),
+        post.group.slug if post.group else '',
+        show_author,
+    )
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode()
+    ).hexdigest()
+    return f'post-card:{post.pk}:{digest}'
+
+
+def render(posts, show_author=True):
+    """HTML карточек постов в порядке ``posts``."""
+    keys = [(_key(post, show_author), post) for post in posts]
+    cached = cache.get_many([key for key, _ in keys])
+    template = get_template(CARD_TEMPLATE)
+    cards = []
+    fresh = {}
+    for key, post in keys:
+        card = cached.get(key)
+        if card is None:
+            fallbacks = thumbnails.fallback_count()
+            card = template.render({'post': post, 'show_author': show_author})
+            if thumbnails.fallback_count() == fallbacks:
+                fresh[key] = card
+        cards.append(card)
+    if fresh:
+        cache.set_many(fresh, settings.POST_CARD_CACHE_TIMEOUT)
+    return cards
@@ -0,0 +1,62 @@
+"""Постраничная выдача комментариев поста.
+
+Комментарии листаются курсором от новых к старым. Первая страница,
+которую получает каждый просмотр поста, хранится в кеше и удаляется
+сигналами при добавлении или удалении комментария.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import reverse
+
+from . import queries
+from .paginator import CursorPaginator
+
+COMMENTS_PER_PAGE = 20
+
+
+def _cache_key(post_id):
+    return f'post-comments:{post_id}'
+
+
+def _load_page(post_id, cursor=None, using=None):
+    paginator = CursorPaginator(
+        queries.comment_thread(post_id).using(using),
+        COMMENTS_PER_PAGE,
+        queries.COMMENT_ORDERING,
+    )
+    page = paginator.get_page(cursor)
+    return {'comments': list(page), 'next_cursor': page.next_cursor}
+
+
+def get_page(post_id, cursor=None):
+    """Страница комментариев: ``{'comments': [...], 'next_cursor': ...}``.
+
+    Курсор листает только вперёд, первая страница берётся из кеша.
+    """
+    if cursor:
+        return _load_page(post_id, cursor)
+    key = _cache_key(post_id)
+    page = cache.get(key)
+    if page is None:
+        # Страница в кеше общая: после сброса её нельзя заполнять
+        # с отстающей реплики.
+        page = _load_page(post_id, using=DEFAULT_DB_ALIAS)
+        cache.set(key, page, settings.COMMENTS_CACHE_TIMEOUT)
+    return page
+
+
+def invalidate(post_id):
+    cache.delete(_cache_key(post_id))
+
+
+def to_dict(comment):
+    return {
+        'id': comment.pk,
+        'author': comment.author.username,
+        'author_url': reverse(
+            'posts:profile', args=(comment.author.username,)
+        ),
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+    }
@@ -0,0 +1,154 @@
+"""Условный GET для страниц лент и поста.
+
+Валидаторы страницы считаются без рендеринга шаблона: для ленты — дата
+последнего поста и версии ленты из ``feed_cache`` (меняются при правке
+и удалении постов), для поста — время правки и число комментариев.
+В ETag входят также пользователь и строка запроса, потому что от них
+зависит HTML; Last-Modified передаётся справочно. ETag слабый: страницы
+с формами содержат каждый раз новую маску CSRF-токена. Страница, где
+вместо ещё не готовой миниатюры показан исходник, уходит без валидаторов.
+"""
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from . import feed_cache, queries, thumbnails
+from .models import Group, Post, TimelineEntry
+
+User = get_user_model()
+
+
+def _timestamp(value):
+    return value.timestamp() if value else 0
+
+
+def _latest(queryset):
+    """Дата последнего поста: первая строка индекса по -pub_date."""
+    return queryset.order_by('-pub_date').values_list(
+        'pub_date', flat=True
+    ).first()
+
+
+def _with_latest(queryset, lookup, *fields):
+    """(pk, дата последнего поста, *fields) объекта одним запросом.
+
+    Коррелированный подзапрос читает одну строку индекса
+    (связь, -pub_date, -id).
+    """
+    latest = Post.objects.filter(
+        **{lookup: OuterRef('pk')}
+    ).order_by('-pub_date').values('pub_date')[:1]
+    return queryset.annotate(latest=Subquery(latest)).values_list(
+        'pk', 'latest', *fields
+    ).first()
+
+
+def index(request):
+    return ['index', *feed_cache.get_versions('index')], _latest(
+        queries.index_feed()
+    )
+
+
+def group_posts(request, slug):
+    group = _with_latest(Group.objects.filter(slug=slug), 'group')
+    if group is None:
+        return None
+    group_id, latest = group
+    return [
+        f'group:{group_id}', *feed_cache.get_versions(f'group:{group_id}')
+    ], latest
+
+
+def profile(request, username):
+    author = _with_latest(
+        User.objects.filter(username=username), 'author',
+        'stats__follower_count', 'stats__following_count',
+    )
+    if author is None:
+        return None
+    author_id, latest, *counts = author
+    # Кнопка подписки зависит от подписок текущего пользователя,
+    # а счётчики подписчиков выводятся вне кешируемого фрагмента.
+    versions = feed_cache.get_versions(
+        f'profile:{author_id}', f'follow:{request.user.pk}'
+    )
+    return [f'profile:{author_id}', *versions, *counts], latest
+
+
+def post_detail(request, post_id):
+    post = Post.objects.filter(pk=post_id).values(
+        'updated_at', 'comment_count', 'author__stats__post_count'
+    ).first()
+    if post is None:
+        return None
+    return [
+        f'post:{post_id}',
+        *feed_cache.get_versions(),
+        post['comment_count'],
+        post['author__stats__post_count'],
+    ], post['updated_at']
+
+
+def follow_index(request):
+    user_id = request.user.pk
+    versions = feed_cache.get_versions(f'follow:{user_id}', 'follow')
+    return [f'follow:{user_id}', *versions], _latest(
+        TimelineEntry.objects.filter(user_id=user_id)
+    )
+
+
+def conditional_page(validators):
+    """Отвечает 304, если страница не изменилась с прошлого запроса.
+
+    ``validators(request, *args, **kwargs)`` возвращает (части ETag,
+    дату изменения) или None, если объекта нет и ответ даст само
+    представление.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            result = validators(request, *args, **kwargs)
+            if result is None:
+                return view(request, *args, **kwargs)
+            parts, last_modified = result
+            user = request.user.pk if request.user.is_authenticated else ''
+            parts += [_timestamp(last_modified), user,
+                      request.GET.urlencode()]
+            digest = hashlib.md5(
+                ':'.join(str(part) for part in parts).encode()
+            ).hexdigest()
+            etag = f'W/"{digest}"'
+            last_modified = (
+                timegm(last_modified.utctimetuple()) if last_modified
+                else None
+            )
+            # 304 решается только по ETag: дата не учитывает пользователя,
+            # комментарии и правки старых постов ленты.
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                fallbacks = thumbnails.fallback_count()
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if thumbnails.fallback_count() != fallbacks:
+                    # Вместо миниатюры показан исходник: когда миниатюра
+                    # будет готова, страница изменится без смены версий.
+                    patch_cache_control(response, no_cache=True)
+                    return response
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Браузер не должен показывать копию без проверки валидаторов.
+            patch_cache_control(response, no_cache=True)
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True)
+            return response
+        return wrapper
+    return decorator
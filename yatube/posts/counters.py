@@ -0,0 +1,104 @@
+"""Денормализованные счётчики постов, комментариев и подписок.
+
+Счётчики меняются одним ``UPDATE ... SET n = n ± 1`` без чтения
+текущего значения, поэтому параллельные запросы не теряют изменений.
+Расхождения исправляет команда ``reconcile_counters``.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Follow, Post, UserStats
+
+User = get_user_model()
+
+USER_COUNTERS = {
+    'post_count': (Post, 'author'),
+    'follower_count': (Follow, 'author'),
+    'following_count': (Follow, 'user'),
+}
+
+
+def change_user_counter(user_id, field, delta):
+    stats = UserStats.objects.filter(user_id=user_id)
+    if delta < 0:
+        stats = stats.filter(**{f'{field}__gte': -delta})
+    if not stats.update(**{field: F(field) + delta}) and delta > 0:
+        UserStats.objects.get_or_create(user_id=user_id)
+        UserStats.objects.filter(user_id=user_id).update(
+            **{field: F(field) + delta}
+        )
+
+
+def change_users_counter(user_ids, field, delta):
+    """``change_user_counter`` для многих пользователей сразу."""
+    if delta > 0:
+        UserStats.objects.bulk_create(
+            [UserStats(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+    stats = UserStats.objects.filter(user_id__in=user_ids)
+    if delta < 0:
+        stats = stats.filter(**{f'{field}__gte': -delta})
+    stats.update(**{field: F(field) + delta})
+
+
+def change_comment_counter(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+def get_stats(user):
+    """Счётчики пользователя; для пользователя без записи — нули."""
+    try:
+        return user.stats
+    except UserStats.DoesNotExist:
+        return UserStats(user=user)
+
+
+def _actual_count(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field: OuterRef('pk')}
+            ).order_by().values(field).annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        0,
+    )
+
+
+def reconcile():
+    """Пересчитывает счётчики по данным; возвращает число исправлений."""
+    fixed = 0
+    users = User.objects.annotate(
+        **{
+            f'actual_{field}': _actual_count(model, lookup)
+            for field, (model, lookup) in USER_COUNTERS.items()
+        }
+    ).values_list(
+        'pk',
+        *(f'actual_{field}' for field in USER_COUNTERS),
+        *(f'stats__{field}' for field in USER_COUNTERS),
+    )
+    size = len(USER_COUNTERS)
+    for row in users.iterator():
+        user_id, actual = row[0], row[1:size + 1]
+        stored = tuple(value or 0 for value in row[size + 1:])
+        if actual != stored:
+            UserStats.objects.update_or_create(
+                user_id=user_id,
+                defaults=dict(zip(USER_COUNTERS, actual)),
+            )
+            fixed += 1
+    comment_count = _actual_count(Comment, 'post')
+    drifted = Post.objects.annotate(
+        actual=comment_count
+    ).exclude(comment_count=F('actual')).values('pk')
+    fixed += Post.objects.filter(
+        pk__in=Subquery(drifted)
+    ).update(comment_count=comment_count)
+    return fixed
@@ -0,0 +1,87 @@
+"""Кеш фрагментов лент.
+
+Ключ фрагмента складывается из имени ленты, её версии, курсора страницы
+и состояния авторизации. При изменении постов сигналы увеличивают версию
+затронутых лент, и старые фрагменты становятся недостижимыми — их не нужно
+искать и удалять, они вытесняются по таймауту.
+
+Запрос, читающий с реплики, может отрисовать новую версию ленты по ещё
+не дошедшим до реплики данным. Поэтому ``REPLICA_PIN_SECONDS`` после
+изменения ленты такие запросы фрагмент не кешируют.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.db_router import reads_replica
+
+ALL_FEEDS = 'all'
+TRENDING = 'trending'
+POPULAR_GROUPS = 'popular-groups'
+
+
+def _version_key(feed):
+    return f'feed-version:{feed}'
+
+
+def _changed_key(feed):
+    return f'feed-changed:{feed}'
+
+
+def _initial_version():
+    # Версия, потерянная при вытеснении, не должна совпасть с прежней.
+    return int(time.time() * 1000)
+
+
+def get_versions(*feeds):
+    keys = [_version_key(feed) for feed in (ALL_FEEDS, *feeds)]
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _recently_changed(*feeds):
+    keys = [_changed_key(feed) for feed in (ALL_FEEDS, *feeds)]
+    return bool(cache.get_many(keys))
+
+
+def invalidate(*feeds):
+    if settings.DATABASE_REPLICAS:
+        cache.set_many(
+            {_changed_key(feed): True for feed in feeds},
+            settings.REPLICA_PIN_SECONDS,
+        )
+    for feed in feeds:
+        key = _version_key(feed)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), None)
+
+
+def get_context(request, *feeds):
+    """Время жизни и ключ фрагмента ленты в кеше шаблона."""
+    versions = '.'.join(str(version) for version in get_versions(*feeds))
+    auth = 'auth' if request.user.is_authenticated else 'anon'
+    cursor = request.GET.get('cursor', '')
+    timeout = settings.FEED_CACHE_TIMEOUT
+    if reads_replica() and _recently_changed(*feeds):
+        # Нулевой таймаут: фрагмент отрисуется, но в кеш не попадёт.
+        timeout = 0
+    return {
+        'cache_key': f'{feeds[0]}:{versions}:{auth}:{cursor}',
+        'cache_timeout': timeout,
+    }
+
+
+def post_feeds(post, group_ids=()):
+    """Ленты, в которых может показываться пост."""
+    feeds = {'index', 'follow', TRENDING, f'profile:{post.author_id}'}
+    for group_id in (post.group_id, *group_ids):
+        if group_id is not None:
+            feeds.add(f'group:{group_id}')
+    return feeds
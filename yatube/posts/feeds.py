@@ -0,0 +1,158 @@
+"""RSS и Atom ленты: общая, по группе и по автору.
+
+Перед сборкой ленты проверяется ETag из даты последнего поста и версии
+ленты в ``feed_cache``. Если клиент уже видел эту версию, он получает 304
+после одного индексного запроса ``MAX(pub_date)``. Last-Modified (дата
+последнего поста) только сообщается: правка или удаление поста её не
+меняют, поэтому 304 решается только по ETag. Собранный XML кешируется под
+тем же ETag, схемой и хостом, поэтому другие опрашивающие клиенты
+получают готовый ответ.
+"""
+from calendar import timegm
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from . import feed_cache, queries
+from .models import Group
+
+User = get_user_model()
+
+FEED_ITEMS = 20
+
+
+class PostsFeed(Feed):
+    """Лента последних постов с условным GET и кешем ответа."""
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        latest = self.items_queryset(obj).aggregate(
+            latest=Max('pub_date')
+        )['latest']
+        versions = '.'.join(
+            str(version)
+            for version in feed_cache.get_versions(self.feed_name(obj))
+        )
+        etag = quote_etag(
+            f'{self.feed_type.__name__}-{self.feed_name(obj)}-'
+            f'{latest.timestamp() if latest else 0}-{versions}'
+        )
+        last_modified = timegm(latest.utctimetuple()) if latest else None
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            # Ссылки в XML абсолютные: они зависят от схемы и хоста.
+            key = f'syndication:{request.scheme}:{request.get_host()}:{etag}'
+            cached = cache.get(key)
+            if cached is None:
+                feed = self.get_feed(obj, request)
+                cached = (feed.writeString('utf-8'), feed.content_type)
+                cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+            response = HttpResponse(cached[0], content_type=cached[1])
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def feed_name(self, obj):
+        return 'index'
+
+    def items_queryset(self, obj):
+        return queries.index_feed()
+
+    def items(self, obj):
+        return self.items_queryset(obj).order_by(
+            '-pub_date', '-id'
+        )[:FEED_ITEMS]
+
+    def title(self, obj):
+        return 'Yatube: последние записи'
+
+    def link(self, obj):
+        return reverse('posts:index')
+
+    def description(self, obj):
+        return self.title(obj)
+
+    def item_title(self, item):
+        return truncatechars(item.text, 50)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('posts:profile', args=(item.author.username,))
+
+
+class GroupPostsFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def feed_name(self, obj):
+        return f'group:{obj.pk}'
+
+    def items_queryset(self, obj):
+        return queries.group_feed(obj)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=(obj.slug,))
+
+    def description(self, obj):
+        return obj.description
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def feed_name(self, obj):
+        return f'profile:{obj.pk}'
+
+    def items_queryset(self, obj):
+        return queries.profile_feed(obj)
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=(obj.username,))
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class PostsAtomFeed(AtomFeedMixin, PostsFeed):
+    pass
+
+
+class GroupPostsAtomFeed(AtomFeedMixin, GroupPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
@@ -0,0 +1,119 @@
+"""Подписки пользователя: множество авторов и массовые изменения.
+
+Множество id авторов, на которых подписан пользователь, хранится в кеше
+и читается не больше одного раза за запрос, поэтому страницы отвечают
+на вопрос «подписан ли я на автора» без запроса к ``Follow``.
+
+Имена авторов разрешаются одним запросом, подписки создаются одним
+``bulk_create`` и удаляются одним DELETE. Сигналы при этом не
+отправляются, поэтому ленты подписок и счётчики обновляются здесь же
+запросами на всю пачку, а не на каждого автора. Расхождения счётчиков
+при гонке с параллельной подпиской исправляет ``reconcile_counters``.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from . import counters, feed_cache, timeline
+from .models import Follow
+
+User = get_user_model()
+
+
+def _cache_key(user_id):
+    return f'following:{user_id}'
+
+
+def followed_ids(user):
+    """Множество id авторов, на которых подписан пользователь."""
+    if not user.is_authenticated:
+        return frozenset()
+    ids = getattr(user, '_followed_ids', None)
+    if ids is None:
+        key = _cache_key(user.pk)
+        ids = cache.get(key)
+        if ids is None:
+            # Кеш читают все запросы: заполнять его с отстающей реплики
+            # после сброса нельзя.
+            ids = frozenset(Follow.objects.using(DEFAULT_DB_ALIAS).filter(
+                user_id=user.pk
+            ).values_list('author_id', flat=True))
+            cache.set(key, ids, settings.FOLLOWING_CACHE_TIMEOUT)
+        # Пользователь запроса живёт один запрос.
+        user._followed_ids = ids
+    return ids
+
+
+def is_following(user, author_id):
+    return author_id in followed_ids(user)
+
+
+def invalidate(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def _delete_follows(user_id, author_ids):
+    """Удаляет подписки одним DELETE.
+
+    QuerySet.delete() сначала выбирает строки и отправляет сигналы для
+    каждой подписки, а их работу ``apply`` делает сама на всю пачку.
+    """
+    meta = Follow._meta
+    placeholders = ', '.join(['%s'] * len(author_ids))
+    with connections[router.db_for_write(Follow)].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {meta.db_table} '
+            f'WHERE {meta.get_field("user").column} = %s '
+            f'AND {meta.get_field("author").column} IN ({placeholders})',
+            [user_id, *author_ids],
+        )
+
+
+def apply(user, follow=(), unfollow=()):
+    """Подписывает ``user`` на авторов ``follow`` и отписывает от ``unfollow``.
+
+    Возвращает словарь с именами авторов: ``followed`` и ``unfollowed`` —
+    подписки, которые действительно изменились, ``not_found`` — неизвестные
+    имена. Подписка на себя пропускается.
+    """
+    ids = dict(
+        User.objects.filter(
+            username__in={*follow, *unfollow}
+        ).values_list('username', 'pk')
+    )
+    follow_ids = {ids[name] for name in follow if name in ids} - {user.pk}
+    unfollow_ids = {ids[name] for name in unfollow if name in ids}
+    with transaction.atomic():
+        existing = set(Follow.objects.filter(
+            user=user, author_id__in=follow_ids | unfollow_ids
+        ).values_list('author_id', flat=True))
+        followed = follow_ids - existing
+        unfollowed = unfollow_ids & existing
+        if followed:
+            Follow.objects.bulk_create(
+                [Follow(user=user, author_id=pk) for pk in followed],
+                ignore_conflicts=True,
+            )
+            timeline.backfill_many(user.pk, followed)
+            counters.change_users_counter(followed, 'follower_count', 1)
+            counters.change_user_counter(
+                user.pk, 'following_count', len(followed)
+            )
+        if unfollowed:
+            _delete_follows(user.pk, unfollowed)
+            timeline.prune_many(user.pk, unfollowed)
+            counters.change_users_counter(unfollowed, 'follower_count', -1)
+            counters.change_user_counter(
+                user.pk, 'following_count', -len(unfollowed)
+            )
+    if followed or unfollowed:
+        feed_cache.invalidate(f'follow:{user.pk}')
+        invalidate(user.pk)
+        user._followed_ids = None
+    names = {pk: name for name, pk in ids.items()}
+    return {
+        'followed': sorted(names[pk] for pk in followed),
+        'unfollowed': sorted(names[pk] for pk in unfollowed),
+        'not_found': sorted({*follow, *unfollow} - ids.keys()),
+    }
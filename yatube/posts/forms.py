@@ -1,4 +1,6 @@
+from django.core.files.uploadedfile import UploadedFile
 from django.forms import ModelForm
+from .images import ingest
 from .models import Post, Comment
 
 
@@ -7,6 +9,17 @@ class PostForm(ModelForm):
         model = Post
         fields = ['text', 'group', 'image', ]
 
+    def clean_image(self):
+        """Уменьшает и перекодирует новую картинку, запоминает размеры."""
+        image = self.cleaned_data['image']
+        if isinstance(image, UploadedFile):
+            image, width, height = ingest(image)
+            self.instance.image_width = width
+            self.instance.image_height = height
+        elif not image:
+            self.instance.image_width = self.instance.image_height = None
+        return image
+
 
 class CommentForm(ModelForm):
     class Meta:
@@ -0,0 +1,162 @@
+"""Обработка картинок постов при загрузке.
+
+Исходник с камеры весит десятки мегабайт, а sorl декодирует его заново
+при каждой новой миниатюре. Поэтому картинка один раз при загрузке:
+
+* проверяется по размеру файла и числу пикселей;
+* поворачивается по EXIF, после чего EXIF и прочие метаданные
+  отбрасываются;
+* уменьшается до ``IMAGE_MAX_SIDE`` по длинной стороне; JPEG при этом
+  декодируется сразу в уменьшенном масштабе (``Image.draft``);
+* перекодируется в первый формат из ``IMAGE_FORMATS``, который умеет
+  записывать установленный Pillow (WebP есть не в каждой сборке).
+
+Результат пишется во временный файл (до ``FILE_UPLOAD_MAX_MEMORY_SIZE``
+в памяти, дальше на диске), и хранилище копирует его частями.
+Маленькая картинка без метаданных, которая после перекодирования стала
+бы больше, сохраняется как есть. Анимация тоже сохраняется как есть,
+вместе с метаданными: кадры сохранил бы только WebP, а покадровая
+перепаковка ради EXIF не стоит своей цены. Битый или обрезанный файл,
+который Pillow не смог декодировать, отклоняется ``ValidationError``.
+"""
+import math
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, ImageOps
+
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'AVIF': 'avif'}
+SAVE_OPTIONS = {
+    'JPEG': {'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'method': 4},
+    'AVIF': {},
+}
+# Форматы, которые браузеры показывают без перекодирования.
+WEB_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+METADATA = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def output_format(has_alpha):
+    """Первый из ``IMAGE_FORMATS``, доступный Pillow для записи."""
+    Image.init()
+    for name in settings.IMAGE_FORMATS:
+        if name not in Image.SAVE:
+            continue
+        if has_alpha and name == 'JPEG':
+            # В JPEG нет прозрачности.
+            return 'PNG'
+        return name
+    return 'PNG' if has_alpha else 'JPEG'
+
+
+def _check_limits(upload, image):
+    if upload.size > settings.IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            'Файл больше %(limit)s.', code='file_too_large',
+            params={'limit': filesizeformat(settings.IMAGE_MAX_UPLOAD_SIZE)},
+        )
+    width, height = image.size
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            'Слишком большое разрешение: %(width)s×%(height)s.',
+            code='too_many_pixels', params={'width': width, 'height': height},
+        )
+
+
+def _convert(upload, source):
+    icc_profile = source.info.get('icc_profile')
+    image, has_alpha, resized = _decode(source, settings.IMAGE_MAX_SIDE)
+    encoded = _encode(
+        image, upload.name, output_format(has_alpha), icc_profile
+    )
+    return image, resized, encoded
+
+
+def _target_size(size, max_side):
+    ratio = max_side / max(size)
+    if ratio >= 1:
+        return size
+    return tuple(max(1, math.floor(side * ratio)) for side in size)
+
+
+def _decode(image, max_side):
+    """Декодирует картинку сразу уменьшенной, с учётом поворота по EXIF.
+
+    Возвращает (картинка, есть ли прозрачность, уменьшалась ли).
+    """
+    target = _target_size(image.size, max_side)
+    resized = target != image.size
+    if image.format == 'JPEG' and resized:
+        # Масштаб 1/2–1/8 при декодировании: меньше памяти и времени.
+        image.draft('RGB', target)
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    return image, has_alpha, resized
+
+
+def _encode(image, name, image_format, icc_profile):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    extension = EXTENSIONS.get(image_format, image_format.lower())
+    output = UploadedFile(
+        tempfile.SpooledTemporaryFile(
+            settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+        ),
+        f'{stem}.{extension}', Image.MIME.get(image_format),
+    )
+    options = dict(SAVE_OPTIONS.get(image_format, {}))
+    if image_format != 'PNG':
+        options['quality'] = settings.IMAGE_QUALITY
+    if icc_profile:
+        # Цветовой профиль не метаданные: без него цвета поплывут.
+        options['icc_profile'] = icc_profile
+    image.save(output.file, image_format, **options)
+    output.size = output.file.tell()
+    output.seek(0)
+    return output
+
+
+def _keep_original(upload, source, resized, encoded):
+    """Исходник уже компактен: не уменьшался, без метаданных и меньше."""
+    return (
+        not resized
+        and source.format in WEB_FORMATS
+        and not any(key in source.info for key in METADATA)
+        and upload.size <= encoded.size
+    )
+
+
+def ingest(upload):
+    """Обрабатывает загруженный файл картинки.
+
+    Возвращает (файл для сохранения, ширина, высота). Для слишком
+    большого файла или разрешения бросает ``ValidationError``.
+    """
+    upload.seek(0)
+    try:
+        source = Image.open(upload)
+        _check_limits(upload, source)
+        size = source.size
+        if getattr(source, 'is_animated', False):
+            upload.seek(0)
+            return (upload, *size)
+        image, resized, encoded = _convert(upload, source)
+    except (OSError, Image.DecompressionBombError):
+        raise ValidationError(
+            'Файл повреждён или это не картинка.', code='invalid_image'
+        )
+    if _keep_original(upload, source, resized, encoded):
+        encoded.close()
+        upload.seek(0)
+        return (upload, *size)
+    return (encoded, *image.size)
@@ -0,0 +1,249 @@
+import json
+import platform
+import random
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts import follows
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+PERCENTILES = (50, 90, 95, 99)
+SEARCH_QUERIES = ('жизнь', 'дом', 'город')
+
+
+def percentile(sorted_values, rank):
+    """Перцентиль методом ближайшего ранга."""
+    index = max(0, -(-len(sorted_values) * rank // 100) - 1)
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку, пропускную способность и число SQL-запросов '
+        'для каждого маршрута posts.urls и выводит результат в JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на маршрут')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--routes', nargs='*',
+                            help='Имена маршрутов без префикса posts:')
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep-writes', action='store_true',
+                            help='Не удалять данные маршрутов записи')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests должно быть больше нуля')
+        if not Post.objects.exists():
+            raise CommandError(
+                'Нет данных для замеров: запустите manage.py seed_data'
+            )
+        self.random = random.Random(options['seed'])
+        self.post_ids = Post.objects.aggregate(
+            first=Min('pk'), last=Max('pk')
+        )
+        self.reader = Follow.objects.select_related('user').first()
+        self.reader = self.reader.user if self.reader else (
+            User.objects.first()
+        )
+        self.group_slugs = list(
+            Group.objects.values_list('slug', flat=True)[:100]
+        )
+        self.guest = Client()
+        self.client = Client()
+        self.client.force_login(self.reader)
+        routes = self.get_routes()
+        if not self.group_slugs:
+            del routes['group_list']
+        selected = options['routes'] or list(routes)
+        unknown = set(selected) - set(routes)
+        if unknown:
+            raise CommandError(f'Неизвестные маршруты: {sorted(unknown)}')
+        results = {}
+        # Запросы записи фиксируются как обычно, каждый в своей
+        # транзакции, и задержка включает COMMIT. Созданное маршрутом
+        # удаляется через ORM после замера, чтобы сигналы сбросили
+        # версии лент и кеши, построенные по этим строкам.
+        for name in selected:
+            state = self.snapshot()
+            results[name] = self.measure(
+                name, routes[name], options['requests'], options['warmup'],
+            )
+            if not options['keep_writes']:
+                self.restore(state)
+        report = json.dumps(
+            {'environment': self.environment(), 'routes': results},
+            ensure_ascii=False, indent=2,
+        )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+        else:
+            self.stdout.write(report)
+
+    def snapshot(self):
+        """Состояние, которое меняют маршруты записи."""
+        own_post = Post.objects.filter(author=self.reader).only(
+            'text'
+        ).first()
+        return {
+            'post': Post.objects.aggregate(last=Max('pk'))['last'] or 0,
+            'comment': Comment.objects.aggregate(
+                last=Max('pk')
+            )['last'] or 0,
+            'own_post': own_post and (own_post.pk, own_post.text),
+            'following': set(Follow.objects.filter(
+                user=self.reader
+            ).values_list('author__username', flat=True)),
+        }
+
+    def restore(self, state):
+        Comment.objects.filter(pk__gt=state['comment']).delete()
+        Post.objects.filter(pk__gt=state['post']).delete()
+        if state['own_post'] is not None:
+            pk, text = state['own_post']
+            post = Post.objects.get(pk=pk)
+            if post.text != text:
+                post.text = text
+                post.save()
+        following = set(Follow.objects.filter(
+            user=self.reader
+        ).values_list('author__username', flat=True))
+        follows.apply(
+            self.reader,
+            follow=state['following'] - following,
+            unfollow=following - state['following'],
+        )
+
+    def environment(self):
+        return {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'rows': {
+                model._meta.model_name: model.objects.count()
+                for model in (User, Group, Post, Comment, Follow)
+            },
+        }
+
+    def random_post_id(self):
+        """Случайный существующий пост без ORDER BY RANDOM()."""
+        pk = self.random.randint(
+            self.post_ids['first'], self.post_ids['last']
+        )
+        return Post.objects.filter(pk__gte=pk).values_list(
+            'pk', flat=True
+        ).order_by('pk').first() or self.post_ids['first']
+
+    def random_group(self):
+        return self.random.choice(self.group_slugs)
+
+    def random_author(self):
+        post = Post.objects.select_related('author').only(
+            'author__username'
+        ).get(pk=self.random_post_id())
+        return post.author.username
+
+    def get_routes(self):
+        """Маршрут — (клиент, метод, функция, готовящая url и данные).
+
+        Подготовка аргументов обращается к базе, поэтому выполняется
+        до начала замера запроса.
+        """
+        client, guest = self.client, self.guest
+        text = {'text': 'Замер'}
+        return {
+            'index': (guest, 'get', lambda: (reverse('posts:index'), None)),
+            'group_list': (guest, 'get', lambda: (reverse(
+                'posts:group_list', args=[self.random_group()]
+            ), None)),
+            'profile': (guest, 'get', lambda: (reverse(
+                'posts:profile', args=[self.random_author()]
+            ), None)),
+            'post_detail': (guest, 'get', lambda: (reverse(
+                'posts:post_detail', args=[self.random_post_id()]
+            ), None)),
+            'search': (guest, 'get', lambda: (
+                reverse('posts:search'),
+                {'q': self.random.choice(SEARCH_QUERIES)},
+            )),
+            'follow_index': (client, 'get', lambda: (
+                reverse('posts:follow_index'), None
+            )),
+            'post_create': (client, 'post', lambda: (
+                reverse('posts:post_create'), text
+            )),
+            'post_edit': (client, 'post', lambda: (
+                reverse('posts:post_edit', args=[self.own_post_id()]), text
+            )),
+            'add_comment': (client, 'post', lambda: (
+                reverse('posts:add_comment', args=[self.random_post_id()]),
+                text,
+            )),
+            'profile_follow': (client, 'get', lambda: (reverse(
+                'posts:profile_follow', args=[self.random_author()]
+            ), None)),
+            'profile_unfollow': (client, 'get', lambda: (reverse(
+                'posts:profile_unfollow', args=[self.random_author()]
+            ), None)),
+        }
+
+    def own_post_id(self):
+        post = Post.objects.filter(author=self.reader).only('pk').first()
+        if post is None:
+            post = Post.objects.create(author=self.reader, text='Замер')
+        return post.pk
+
+    def measure(self, name, route, count, warmup):
+        client, method, prepare = route
+        send = getattr(client, method)
+        for _ in range(warmup):
+            send(*prepare())
+        timings = []
+        statuses = {}
+        for _ in range(count):
+            url, data = prepare()
+            before = time.perf_counter()
+            response = send(url, data)
+            timings.append(time.perf_counter() - before)
+            statuses[response.status_code] = (
+                statuses.get(response.status_code, 0) + 1
+            )
+        # Число запросов считается отдельно: запись SQL замедляет замер.
+        url, data = prepare()
+        with CaptureQueriesContext(connection) as queries:
+            send(url, data)
+        elapsed = sum(timings)
+        timings.sort()
+        result = {
+            'requests': count,
+            'throughput_rps': round(count / elapsed, 1),
+            'mean_ms': round(sum(timings) / count * 1000, 2),
+            'max_ms': round(timings[-1] * 1000, 2),
+            'queries': len(queries),
+            'status_codes': {
+                str(code): total for code, total in sorted(statuses.items())
+            },
+        }
+        for rank in PERCENTILES:
+            result[f'p{rank}_ms'] = round(
+                percentile(timings, rank) * 1000, 2
+            )
+        self.stderr.write(
+            f'{name:<18}{result["p50_ms"]:>8} мс p50 '
+            f'{result["p99_ms"]:>8} мс p99 {result["queries"]:>3} SQL'
+        )
+        return result
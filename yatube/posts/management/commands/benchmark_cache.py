@@ -0,0 +1,159 @@
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from .benchmark import PERCENTILES, percentile
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'filebased': 'django.core.cache.backends.filebased.FileBasedCache',
+    'sqlite': 'core.cache.SQLiteCache',
+}
+LOCATIONS = {
+    'locmem': lambda directory: 'benchmark',
+    'filebased': lambda directory: os.path.join(directory, 'files'),
+    'sqlite': lambda directory: os.path.join(directory, 'cache.sqlite3'),
+}
+# Как feed_cache.get_versions: версии нескольких лент одним get_many.
+MANY_KEYS = 4
+
+
+def _cache(name, location, entries):
+    return import_string(BACKENDS[name])(
+        location, {'OPTIONS': {'MAX_ENTRIES': entries}}
+    )
+
+
+def _timed(operation, arguments):
+    timings = []
+    for argument in arguments:
+        before = time.perf_counter()
+        operation(argument)
+        timings.append(time.perf_counter() - before)
+    return timings
+
+
+def mixed_load(name, location, entries, worker, keys, operations,
+               write_ratio, value, seed):
+    """Процесс-воркер: чтения и записи в пропорции ``write_ratio``."""
+    rng = random.Random(seed)
+    cache = _cache(name, location, entries)
+    own = [f'w{worker}:{number}' for number in range(keys)]
+    cache.set_many({key: value for key in own})
+    started = time.perf_counter()
+    for _ in range(operations):
+        key = rng.choice(own)
+        if rng.random() < write_ratio:
+            cache.set(key, value)
+        else:
+            cache.get(key)
+    return operations / (time.perf_counter() - started)
+
+
+def shared_hits(name, location, entries, worker, workers, keys):
+    """Доля ключей соседнего воркера, видимых этому процессу."""
+    cache = _cache(name, location, entries)
+    neighbour = (worker + 1) % workers
+    found = cache.get_many(
+        [f'w{neighbour}:{number}' for number in range(keys)]
+    )
+    return len(found) / keys
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержки и пропускную способность бэкендов кеша '
+        'locmem, filebased и sqlite в одном и в нескольких процессах'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='*', choices=list(BACKENDS),
+                            default=list(BACKENDS))
+        parser.add_argument('--keys', type=int, default=1000)
+        parser.add_argument('--size', type=int, default=4096,
+                            help='Размер значения в байтах, как у фрагмента')
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--operations', type=int, default=5000,
+                            help='Операций на процесс в смешанной нагрузке')
+        parser.add_argument('--write-ratio', type=float, default=0.1)
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            results = {
+                name: self.run(name, LOCATIONS[name](directory), options)
+                for name in options['backends']
+            }
+        report = json.dumps({
+            'keys': options['keys'],
+            'value_bytes': options['size'],
+            'workers': options['workers'],
+            'write_ratio': options['write_ratio'],
+            'backends': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+        else:
+            self.stdout.write(report)
+
+    def run(self, name, location, options):
+        keys = options['keys']
+        workers = options['workers']
+        entries = keys * (workers + 1) * 2
+        value = 'x' * options['size']
+        cache = _cache(name, location, entries)
+        cache.clear()
+        names = [f'key:{number}' for number in range(keys)]
+        many = [names[start:start + MANY_KEYS]
+                for start in range(0, keys, MANY_KEYS)]
+        cache.set('counter', 0)
+        operations = {
+            'set': _timed(lambda key: cache.set(key, value), names),
+            'get_hit': _timed(cache.get, names),
+            'get_miss': _timed(cache.get, [f'missing:{key}' for key in names]),
+            'get_many': _timed(cache.get_many, many),
+            'incr': _timed(lambda key: cache.incr('counter'), names),
+        }
+        result = {
+            operation: self.summary(timings)
+            for operation, timings in operations.items()
+        }
+        arguments = (name, location, entries)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            throughput = pool.map(
+                mixed_load, *zip(*(
+                    (*arguments, worker, keys, options['operations'],
+                     options['write_ratio'], value, worker)
+                    for worker in range(workers)
+                ))
+            )
+            result['mixed_ops_per_second'] = round(sum(throughput))
+        # Новые процессы: locmem не видит записей других воркеров.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hits = list(pool.map(
+                shared_hits, *zip(*(
+                    (*arguments, worker, workers, keys)
+                    for worker in range(workers)
+                ))
+            ))
+        result['shared_hit_ratio'] = round(sum(hits) / workers, 3)
+        self.stderr.write(
+            f'{name}: get {result["get_hit"]["p50_us"]} мкс, '
+            f'{result["mixed_ops_per_second"]} оп/с в {workers} процессах, '
+            f'общих попаданий {result["shared_hit_ratio"]:.0%}'
+        )
+        return result
+
+    def summary(self, timings):
+        timings = sorted(timings)
+        result = {'ops_per_second': round(len(timings) / sum(timings))}
+        for rank in PERCENTILES:
+            result[f'p{rank}_us'] = round(percentile(timings, rank) * 1e6, 1)
+        return result
@@ -0,0 +1,180 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.sqlite import apply_pragmas
+
+from .benchmark import PERCENTILES, percentile
+
+# Поведение до настройки: журнал отката и синхронизация по умолчанию.
+DEFAULT_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+INSERT_COMMENT = (
+    'INSERT INTO posts_comment (post_id, author_id, text, created) '
+    "VALUES (?, ?, ?, datetime('now'))"
+)
+UPDATE_COMMENT_COUNT = (
+    'UPDATE posts_post SET comment_count = comment_count + 1 WHERE id = ?'
+)
+READ_FEED = (
+    'SELECT id, text, pub_date FROM posts_post '
+    'ORDER BY pub_date DESC, id DESC LIMIT 11'
+)
+
+
+def _connect(path, pragmas):
+    connection = sqlite3.connect(path, isolation_level=None)
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def write_comments(path, pragmas, writes, post_ids, user_ids, seed):
+    """Процесс-писатель: добавляет комментарии так же, как add_comment."""
+    rng = random.Random(seed)
+    connection = _connect(path, pragmas)
+    timings = []
+    errors = 0
+    started = time.time()
+    for _ in range(writes):
+        before = time.perf_counter()
+        try:
+            post_id = rng.choice(post_ids)
+            connection.execute(
+                INSERT_COMMENT, (post_id, rng.choice(user_ids), 'Замер')
+            )
+            connection.execute(UPDATE_COMMENT_COUNT, (post_id,))
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        timings.append(time.perf_counter() - before)
+    finished = time.time()
+    connection.close()
+    return started, finished, timings, errors
+
+
+def read_feed(path, pragmas, reads):
+    """Процесс-читатель: запрашивает первую страницу главной ленты."""
+    connection = _connect(path, pragmas)
+    errors = 0
+    for _ in range(reads):
+        try:
+            connection.execute(READ_FEED).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+    connection.close()
+    return errors
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность параллельной записи '
+        'комментариев в SQLite без настройки и с SQLITE_PRAGMAS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=16)
+        parser.add_argument('--writes', type=int, default=200,
+                            help='Записей на процесс-писатель')
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--reads', type=int, default=500,
+                            help='Чтений на процесс-читатель')
+        parser.add_argument('--output', help='Файл для JSON-отчёта')
+
+    def handle(self, *args, **options):
+        database = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if not database['ENGINE'].endswith('sqlite3'):
+            raise CommandError('Команда работает только с SQLite')
+        scenarios = {
+            'default': DEFAULT_PRAGMAS,
+            'tuned': settings.SQLITE_PRAGMAS,
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            results = {
+                name: self.run(
+                    database['NAME'],
+                    os.path.join(directory, f'{name}.sqlite3'),
+                    pragmas,
+                    options,
+                )
+                for name, pragmas in scenarios.items()
+            }
+        report = json.dumps({
+            'writers': options['writers'],
+            'writes_per_writer': options['writes'],
+            'readers': options['readers'],
+            'scenarios': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report)
+        else:
+            self.stdout.write(report)
+
+    def copy_database(self, source_path, path, pragmas):
+        """Копия базы с режимом журнала сценария."""
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(path)
+        try:
+            source.backup(target)
+            apply_pragmas(target.cursor(), pragmas)
+            post_ids = [row[0] for row in target.execute(
+                'SELECT id FROM posts_post ORDER BY id LIMIT 1000'
+            )]
+            user_ids = [row[0] for row in target.execute(
+                'SELECT id FROM auth_user ORDER BY id LIMIT 1000'
+            )]
+        finally:
+            target.close()
+            source.close()
+        if not post_ids:
+            raise CommandError(
+                'Нет постов для замеров: запустите manage.py seed_data'
+            )
+        return post_ids, user_ids
+
+    def run(self, source_path, path, pragmas, options):
+        post_ids, user_ids = self.copy_database(source_path, path, pragmas)
+        writers, readers = options['writers'], options['readers']
+        with ProcessPoolExecutor(max_workers=writers + readers) as pool:
+            reads = [
+                pool.submit(read_feed, path, pragmas, options['reads'])
+                for _ in range(readers)
+            ]
+            writes = [
+                pool.submit(
+                    write_comments, path, pragmas, options['writes'],
+                    post_ids, user_ids, seed,
+                )
+                for seed in range(writers)
+            ]
+            results = [future.result() for future in writes]
+            read_errors = sum(future.result() for future in reads)
+        started = min(result[0] for result in results)
+        finished = max(result[1] for result in results)
+        timings = sorted(
+            timing for result in results for timing in result[2]
+        )
+        result = {
+            'pragmas': pragmas,
+            'writes': len(timings),
+            'write_errors': sum(result[3] for result in results),
+            'read_errors': read_errors,
+            'throughput_wps': round(len(timings) / (finished - started), 1),
+        }
+        for rank in PERCENTILES:
+            result[f'p{rank}_ms'] = round(
+                percentile(timings, rank) * 1000, 2
+            ) if timings else None
+        self.stderr.write(
+            f'{os.path.basename(path)}: {result["throughput_wps"]} записей/с, '
+            f'ошибок записи {result["write_errors"]}'
+        )
+        return result
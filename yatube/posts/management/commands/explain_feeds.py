@@ -0,0 +1,86 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from posts import queries
+from posts.comments import COMMENTS_PER_PAGE
+from posts.models import Follow, Group, Post, TimelineEntry, User
+from posts.paginator import CursorPaginator
+from posts.views import POSTS_PER_PAGE
+
+# SQLite пишет «SCAN [TABLE] t» для полного прохода по таблице
+# и «USE TEMP B-TREE» для сортировки, PostgreSQL — «Seq Scan» и «Sort».
+BAD_PLANS = re.compile(
+    r'\bSCAN (?:TABLE )?\w+\b(?! USING)'
+    r'|USE TEMP B-TREE'
+    r'|Seq Scan on'
+    r'|\bSort\b'
+)
+
+
+def feed_queries():
+    group = Group(pk=1)
+    user = User(pk=1)
+    seek_values = (timezone.now(), 1)
+    feeds = {
+        'index': (queries.index_feed(), ('-pub_date', '-id')),
+        'group_list': (queries.group_feed(group), ('-pub_date', '-id')),
+        'profile': (queries.profile_feed(user), ('-pub_date', '-id')),
+        'follow_index': (
+            queries.follow_feed(user), ('-pub_date', '-post_id')
+        ),
+    }
+    for name, (queryset, ordering) in feeds.items():
+        paginator = CursorPaginator(queryset, POSTS_PER_PAGE, ordering)
+        yield name, paginator.get_queryset()
+        for direction in ('next', 'previous'):
+            yield (
+                f'{name} ({direction} page)',
+                paginator.get_queryset(direction, seek_values),
+            )
+    comments = CursorPaginator(
+        queries.comment_thread(1), COMMENTS_PER_PAGE,
+        queries.COMMENT_ORDERING,
+    )
+    yield 'post comments', comments.get_queryset()
+    yield 'post comments (next page)', comments.get_queryset(
+        'next', seek_values
+    )
+    latest = Post.objects.filter(
+        group=OuterRef('pk')
+    ).order_by('-pub_date').values('pub_date')[:1]
+    yield 'group_list (validators)', Group.objects.filter(
+        slug='group'
+    ).annotate(latest=Subquery(latest)).values_list('pk', 'latest')
+    yield 'follow_index (validators)', TimelineEntry.objects.filter(
+        user_id=1
+    ).order_by('-pub_date').values_list('pub_date')[:1]
+    yield 'followers fan-out', Follow.objects.filter(
+        author_id=1
+    ).values_list('user_id', flat=True)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит планы запросов лент и завершается с ошибкой, если '
+        'какой-то из них читает таблицу целиком или сортирует без индекса'
+    )
+
+    def handle(self, *args, **options):
+        failed = []
+        for name, queryset in feed_queries():
+            plan = queryset.explain()
+            bad = BAD_PLANS.findall(plan)
+            status = self.style.ERROR('FAIL') if bad else 'ok'
+            self.stdout.write(f'{name}: {status}\n{plan}\n')
+            if bad:
+                failed.append(name)
+        if failed:
+            raise CommandError(
+                'Запросы без подходящего индекса: ' + ', '.join(failed)
+            )
+        self.stdout.write(
+            self.style.SUCCESS('Все запросы лент используют индексы')
+        )
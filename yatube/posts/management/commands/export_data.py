@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts import transfer
+
+
+class Command(BaseCommand):
+    help = 'Выгружает группы, посты, комментарии или подписки в JSONL/CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(transfer.SPECS))
+        parser.add_argument('--format', choices=transfer.FORMATS,
+                            default='jsonl')
+        parser.add_argument('--output', help='Файл; по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        spec = transfer.SPECS[options['model']]
+        rows = transfer.export_rows(spec, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='') as output:
+                count = transfer.write_rows(
+                    rows, output, options['format'], spec.fields
+                )
+        else:
+            count = transfer.write_rows(
+                rows, sys.stdout, options['format'], spec.fields
+            )
+        self.stderr.write(f'{options["model"]}: выгружено {count}')
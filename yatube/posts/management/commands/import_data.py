@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, reset_queries, transaction
+
+from posts import transfer
+from posts.bulk import (
+    DERIVED_BY_MODEL, DERIVED_DATA, batched, explicit_dates,
+    invalidate_feeds,
+)
+
+# Сколько id конфликтующих строк показывать в отчёте.
+CONFLICTS_SHOWN = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает группы, посты, комментарии или подписки из JSONL/CSV '
+        'пачками bulk_create; повторный запуск не создаёт дублей'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(transfer.SPECS))
+        parser.add_argument('path', help='Файл или «-» для stdin')
+        parser.add_argument('--format', choices=transfer.FORMATS,
+                            help='По умолчанию — по расширению файла')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить с места, сохранённого в <path>.progress',
+        )
+        parser.add_argument(
+            '--skip-refresh', action='store_true',
+            help='Не пересобирать ленты, счётчики и поисковый индекс',
+        )
+
+    def handle(self, *args, **options):
+        spec = transfer.SPECS[options['model']]
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl'
+        )
+        progress_path = None if path == '-' else f'{path}.progress'
+        done = self.read_progress(progress_path) if options['resume'] else 0
+        if path == '-':
+            self.load(spec, sys.stdin, file_format, done, None, options)
+        else:
+            with open(path, newline='') as source:
+                self.load(
+                    spec, source, file_format, done, progress_path, options
+                )
+        if progress_path and os.path.exists(progress_path):
+            os.remove(progress_path)
+        if not options['skip_refresh']:
+            self.refresh(DERIVED_BY_MODEL[options['model']])
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
+
+    def refresh(self, functions):
+        """Пересобирает производные данные, затронутые загрузкой.
+
+        Пересборка лент начинается с удаления всех записей, поэтому идёт
+        в транзакции: до её конца сайт видит прежние ленты, а при сбое
+        они остаются целыми. Кеш лент сбрасывается после фиксации, иначе
+        его заполнили бы по данным до пересборки.
+        """
+        steps = [
+            (title, function) for title, function in DERIVED_DATA
+            if function in functions
+        ]
+        with transaction.atomic():
+            for title, function in steps:
+                if function is not invalidate_feeds:
+                    self.step(title, function)
+        for title, function in steps:
+            if function is invalidate_feeds:
+                self.step(title, function)
+
+    def step(self, title, function):
+        started = time.perf_counter()
+        function()
+        self.stderr.write(f'{title}: {time.perf_counter() - started:.1f} с')
+
+    def read_progress(self, progress_path):
+        if progress_path is None or not os.path.exists(progress_path):
+            raise CommandError('Нет сохранённого прогресса для --resume')
+        with open(progress_path) as progress:
+            return int(progress.read())
+
+    def load(self, spec, source, file_format, done, progress_path, options):
+        rows = islice(transfer.read_rows(source, file_format), done, None)
+        dates = [spec.model._meta.get_field(spec.date_field)] if (
+            spec.date_field
+        ) else []
+        skipped = 0
+        conflicts = []
+        started = time.perf_counter()
+        with explicit_dates(*dates):
+            for batch in batched(rows, options['batch_size']):
+                objects, missing, taken = transfer.build_objects(
+                    spec, batch
+                )
+                with transaction.atomic():
+                    spec.model.objects.bulk_create(
+                        objects, ignore_conflicts=True
+                    )
+                # При DEBUG журнал запросов хранит каждый INSERT пачки.
+                reset_queries()
+                done += len(batch)
+                skipped += missing
+                conflicts.extend(taken)
+                if progress_path:
+                    # Пачка уже зафиксирована: при сбое её не нужно
+                    # загружать повторно.
+                    with open(progress_path, 'w') as progress:
+                        progress.write(str(done))
+                rate = done / (time.perf_counter() - started)
+                self.stderr.write(
+                    f'\r{spec.model._meta.verbose_name_plural}: {done} строк, '
+                    f'пропущено {skipped}, конфликтов {len(conflicts)} '
+                    f'({rate:.0f} строк/с)',
+                    ending='',
+                )
+        self.stderr.write('')
+        if conflicts:
+            shown = ', '.join(str(pk) for pk in conflicts[:CONFLICTS_SHOWN])
+            more = len(conflicts) - CONFLICTS_SHOWN
+            self.stderr.write(self.style.WARNING(
+                f'Не загружены строки, чей id или пост занят другой записью: '
+                f'{shown}' + (f' и ещё {more}' if more > 0 else '')
+            ))
+        self.reset_sequences(spec.model)
+
+    def reset_sequences(self, model):
+        """Синхронизирует автоинкремент с явно загруженными id."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,153 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import reset_queries, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from posts.bulk import DERIVED_DATA, batched, explicit_dates
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+SENTENCE_POOL_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, группами, постами, '
+        'подписками и комментариями для нагрузочных замеров'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--follows-per-user', type=int, default=20)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=365,
+                            help='За сколько дней распределить даты постов')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        # Faker медленный для миллионов строк: тексты собираются
+        # из заранее сгенерированного набора предложений.
+        self.sentences = [
+            self.faker.sentence() for _ in range(SENTENCE_POOL_SIZE)
+        ]
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.period = timedelta(days=options['days']).total_seconds()
+        with transaction.atomic():
+            user_ids = self.seed_users(options['users'])
+            group_ids = self.seed_groups(options['groups'])
+            post_ids = self.seed_posts(options['posts'], user_ids, group_ids)
+            self.seed_follows(options['follows_per_user'], user_ids)
+            self.seed_comments(options['comments'], user_ids, post_ids)
+            for title, function in DERIVED_DATA:
+                self.step(title, function)
+        self.stdout.write(self.style.SUCCESS('Данные созданы'))
+
+    def step(self, title, function):
+        started = time.perf_counter()
+        function()
+        self.stdout.write(
+            f'{title}: {time.perf_counter() - started:.1f} с'
+        )
+
+    def insert(self, title, model, objects, total, **kwargs):
+        started = time.perf_counter()
+        done = 0
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, **kwargs)
+            reset_queries()
+            done += len(batch)
+            self.stdout.write(f'\r{title}: {done}/{total}', ending='')
+            self.stdout.flush()
+        self.stdout.write(f' ({time.perf_counter() - started:.1f} с)')
+
+    def text(self):
+        return ' '.join(self.random.sample(self.sentences, 4))
+
+    def random_date(self):
+        return self.now - timedelta(seconds=self.random.random() * self.period)
+
+    def seed_users(self, count):
+        start = User.objects.count()
+        password = make_password(None)
+        self.insert('Пользователи', User, (
+            User(
+                username=f'bench_{start + number}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                password=password,
+            )
+            for number in range(count)
+        ), count)
+        return list(User.objects.values_list('pk', flat=True))
+
+    def seed_groups(self, count):
+        start = Group.objects.count()
+        self.insert('Группы', Group, (
+            Group(
+                title=self.faker.sentence(nb_words=3),
+                slug=f'bench-{start + number}',
+                description=self.faker.paragraph(),
+            )
+            for number in range(count)
+        ), count)
+        return list(Group.objects.values_list('pk', flat=True))
+
+    def seed_posts(self, count, user_ids, group_ids):
+        group_choices = group_ids + [None]
+        last = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        with explicit_dates(Post._meta.get_field('pub_date')):
+            self.insert('Посты', Post, (
+                Post(
+                    text=self.text(),
+                    author_id=self.random.choice(user_ids),
+                    group_id=self.random.choice(group_choices),
+                    pub_date=self.random_date(),
+                )
+                for _ in range(count)
+            ), count)
+        # id вставленных постов могут идти с пропусками после удалений.
+        return list(Post.objects.filter(pk__gt=last).values_list(
+            'pk', flat=True
+        ))
+
+    def seed_follows(self, per_user, user_ids):
+        per_user = max(min(per_user, len(user_ids) - 1), 0)
+        total = per_user * len(user_ids)
+        self.insert('Подписки', Follow, (
+            Follow(user_id=user_id, author_id=author_id)
+            for user_id in user_ids
+            for author_id in [
+                author_id
+                for author_id in self.random.sample(user_ids, per_user + 1)
+                if author_id != user_id
+            ][:per_user]
+        ), total, ignore_conflicts=True)
+
+    def seed_comments(self, count, user_ids, post_ids):
+        if not post_ids:
+            return
+        with explicit_dates(Comment._meta.get_field('created')):
+            self.insert('Комментарии', Comment, (
+                Comment(
+                    post_id=self.random.choice(post_ids),
+                    author_id=self.random.choice(user_ids),
+                    text=self.random.choice(self.sentences),
+                    created=self.random_date(),
+                )
+                for _ in range(count)
+            ), count)
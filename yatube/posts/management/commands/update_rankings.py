@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from posts import rankings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги обсуждаемых постов и популярных групп; '
+        'запускается по расписанию, например раз в 10 минут из cron'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=rankings.TOP_SIZE)
+        parser.add_argument(
+            '--half-life-hours', type=float,
+            default=rankings.HALF_LIFE / timedelta(hours=1),
+        )
+        parser.add_argument(
+            '--window-days', type=float,
+            default=rankings.WINDOW / timedelta(days=1),
+        )
+
+    def handle(self, *args, **options):
+        posts, groups = rankings.update(
+            size=options['top'],
+            half_life=timedelta(hours=options['half_life_hours']),
+            window=timedelta(days=options['window_days']),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'В рейтинге постов: {posts}, групп: {groups}'
+        ))
@@ -0,0 +1,64 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:53
+
+from django.conf import settings
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    Follow = apps.get_model('posts', 'Follow')
+    UserStats = apps.get_model('posts', 'UserStats')
+    stats = defaultdict(dict)
+    for model, lookup, field in (
+        (Post, 'author', 'post_count'),
+        (Follow, 'author', 'follower_count'),
+        (Follow, 'user', 'following_count'),
+    ):
+        totals = model.objects.order_by().values_list(lookup).annotate(
+            total=Count('pk')
+        )
+        for user_id, total in totals:
+            stats[user_id][field] = total
+    UserStats.objects.bulk_create(
+        (
+            UserStats(user_id=user_id, **counts)
+            for user_id, counts in stats.items()
+        ),
+        batch_size=1000,
+    )
+    totals = Comment.objects.order_by().values_list('post').annotate(
+        total=Count('pk')
+    )
+    for post_id, total in totals:
+        Post.objects.filter(pk=post_id).update(comment_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0006_timelineentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('follower_count', models.PositiveIntegerField(default=0)),
+                ('following_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
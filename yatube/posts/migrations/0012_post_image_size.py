@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:46
+
+from django.core.files.images import get_image_dimensions
+from django.db import migrations, models
+
+
+def fill_image_size(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.exclude(image='').only('image')
+    for post in posts.iterator():
+        try:
+            width, height = get_image_dimensions(post.image)
+        except (OSError, ValueError):
+            continue
+        if width:
+            Post.objects.filter(pk=post.pk).update(
+                image_width=width, image_height=height
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_rankings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_image_size, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+
+
+class CursorPaginator(Paginator):
+    """Постраничная навигация по ключу (keyset) без COUNT и OFFSET.
+
+    Позиция страницы задаётся непрозрачным курсором, в котором закодированы
+    значения полей сортировки граничной записи. Стоимость запроса не зависит
+    от глубины страницы. Возвращаемый объект страницы — обычный ``Page``
+    с атрибутами ``next_cursor`` и ``previous_cursor``; методы ``Page``,
+    опирающиеся на ``num_pages``, выполняют COUNT и в шаблонах
+    не используются. Страницы можно строить и по ``values()``: тогда
+    значения ключа курсора берутся из словарей строк.
+    """
+
+    def __init__(self, object_list, per_page,
+                 ordering=('-pub_date', '-id')):
+        super().__init__(object_list, per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(key.lstrip('-') for key in self.ordering)
+
+    def _check_object_list_is_ordered(self):
+        # Порядок задаёт сам пагинатор в get_queryset().
+        pass
+
+    def get_page(self, cursor=None):
+        position = self.decode_cursor(cursor)
+        if position is None:
+            direction, values = 'next', None
+        else:
+            direction, values = position
+        items = list(self.get_queryset(direction, values))
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if direction == 'previous':
+            items.reverse()
+        page = Page(items, 1, self)
+        page.next_cursor = None
+        page.previous_cursor = None
+        if items:
+            if direction == 'next' and has_more or (
+                direction == 'previous' and values is not None
+            ):
+                page.next_cursor = self.encode_cursor('next', items[-1])
+            if direction == 'previous' and has_more or (
+                direction == 'next' and values is not None
+            ):
+                page.previous_cursor = self.encode_cursor(
+                    'previous', items[0]
+                )
+        return page
+
+    def get_queryset(self, direction='next', values=None):
+        """Запрос страницы с одной лишней записью для проверки продолжения."""
+        queryset = self.object_list
+        if direction == 'next':
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.order_by(*self._reverse(self.ordering))
+        if values is not None:
+            queryset = queryset.filter(self._seek(direction, values))
+        return queryset[:self.per_page + 1]
+
+    def encode_cursor(self, direction, obj):
+        values = []
+        for field in self.fields:
+            if isinstance(obj, dict):
+                value = obj[field]
+            else:
+                value = getattr(obj, field)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        raw = json.dumps([direction, values]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Возвращает (направление, значения) или None для первой страницы."""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, values = json.loads(raw.decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            return None
+        if direction not in ('next', 'previous') or (
+            not isinstance(values, list) or len(values) != len(self.fields)
+        ):
+            return None
+        try:
+            values = [
+                self._to_python(field, value)
+                for field, value in zip(self.fields, values)
+            ]
+        except ValidationError:
+            return None
+        if any(value is None for value in values):
+            return None
+        return direction, values
+
+    def _to_python(self, field, value):
+        try:
+            model_field = self.object_list.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            # Аннотация запроса: значение из JSON берётся как есть.
+            return value
+        return model_field.to_python(value)
+
+    def _seek(self, direction, values):
+        """Условие «строго после граничной записи» в выбранном направлении.
+
+        Нестрогое условие на первый ключ дублирует дизъюнкцию, чтобы
+        база могла начать чтение индекса с граничной записи.
+        """
+        condition = Q()
+        equal = {}
+        bound = None
+        for key, value in zip(self.ordering, values):
+            field = key.lstrip('-')
+            descending = key.startswith('-')
+            if direction == 'previous':
+                descending = not descending
+            lookup = 'lt' if descending else 'gt'
+            if bound is None:
+                bound = Q(**{f'{field}__{lookup}e': value})
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return bound & condition
+
+    @staticmethod
+    def _reverse(ordering):
+        return tuple(
+            key[1:] if key.startswith('-') else f'-{key}' for key in ordering
+        )
@@ -0,0 +1,69 @@
+"""Запросы лент постов.
+
+Все списковые представления берут посты отсюда: авторы и группы
+подтягиваются одним JOIN, а выбираются только поля, которые выводят
+шаблоны лент, поэтому страница ленты не порождает запросов на каждый пост.
+"""
+from .models import Comment, Group, Post, TimelineEntry
+
+FEED_FIELDS = (
+    'text',
+    'pub_date',
+    'updated_at',
+    'image',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group__slug',
+)
+
+COMMENT_ORDERING = ('-created', '-id')
+
+
+def post_feed():
+    return Post.objects.select_related('author', 'group').only(*FEED_FIELDS)
+
+
+def index_feed():
+    return post_feed()
+
+
+def group_feed(group):
+    return post_feed().filter(group=group)
+
+
+def profile_feed(author):
+    return post_feed().filter(author=author)
+
+
+def follow_feed(user):
+    """Записи ленты подписок; сами посты лежат в ``entry.post``."""
+    return TimelineEntry.objects.filter(
+        user=user
+    ).select_related(
+        'post', 'post__author', 'post__group'
+    ).only(
+        'pub_date', 'post', *(f'post__{field}' for field in FEED_FIELDS)
+    )
+
+
+def trending_feed():
+    """Посты рейтинга ``TrendingPost`` в порядке мест."""
+    return post_feed().filter(
+        trending__isnull=False
+    ).order_by('trending__rank')
+
+
+def popular_groups():
+    return Group.objects.filter(
+        popularity__isnull=False
+    ).order_by('popularity__rank')
+
+
+def comment_thread(post_id):
+    """Комментарии поста с авторами одним запросом."""
+    return Comment.objects.filter(
+        post_id=post_id
+    ).select_related('author').only(
+        'text', 'created', 'author__username'
+    )
@@ -0,0 +1,85 @@
+"""Рейтинги обсуждаемых постов и популярных групп.
+
+Рейтинг считается периодически командой ``update_rankings``, а не при
+запросе страницы. События окна (комментарии к постам, новые посты
+в группах) читаются одним агрегирующим запросом с подсчётом по часам,
+и вес каждого часа убывает вдвое за ``half_life``. Первые ``top``
+объектов сохраняются в таблицы ``TrendingPost`` и ``PopularGroup``,
+из которых страницы читают готовый список.
+"""
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from . import feed_cache
+from .models import Comment, PopularGroup, Post, TrendingPost
+
+TOP_SIZE = 20
+HALF_LIFE = timedelta(hours=24)
+WINDOW = timedelta(days=7)
+
+
+def decayed_scores(rows, now, half_life):
+    """Сумма событий по объектам с экспоненциальным затуханием.
+
+    ``rows`` — тройки (id объекта, час, число событий за час).
+    """
+    scores = defaultdict(float)
+    for object_id, hour, count in rows:
+        age = (now - hour) / half_life
+        scores[object_id] += count * 0.5 ** max(age, 0)
+    return scores
+
+
+def top(scores, size):
+    """Первые ``size`` пар (id, счёт); при равенстве выше новый объект."""
+    return heapq.nlargest(
+        size, scores.items(), key=lambda item: (item[1], item[0])
+    )
+
+
+def _hourly(queryset, key, date_field):
+    return queryset.annotate(
+        hour=TruncHour(date_field)
+    ).order_by().values_list(key, 'hour').annotate(count=Count('pk'))
+
+
+def trending_posts(now, size=TOP_SIZE, half_life=HALF_LIFE, window=WINDOW):
+    rows = _hourly(
+        Comment.objects.filter(created__gte=now - window),
+        'post_id', 'created',
+    )
+    return top(decayed_scores(rows.iterator(), now, half_life), size)
+
+
+def popular_groups(now, size=TOP_SIZE, half_life=HALF_LIFE, window=WINDOW):
+    rows = _hourly(
+        Post.objects.filter(pub_date__gte=now - window, group__isnull=False),
+        'group_id', 'pub_date',
+    )
+    return top(decayed_scores(rows.iterator(), now, half_life), size)
+
+
+def _replace(model, key, ranking):
+    model.objects.all().delete()
+    model.objects.bulk_create(
+        model(**{key: object_id}, rank=rank, score=score)
+        for rank, (object_id, score) in enumerate(ranking, 1)
+    )
+
+
+def update(now=None, **options):
+    """Пересчитывает оба рейтинга; возвращает их длины."""
+    now = now or timezone.now()
+    posts = trending_posts(now, **options)
+    groups = popular_groups(now, **options)
+    with transaction.atomic():
+        _replace(TrendingPost, 'post_id', posts)
+        _replace(PopularGroup, 'group_id', groups)
+    feed_cache.invalidate(feed_cache.TRENDING, feed_cache.POPULAR_GROUPS)
+    return len(posts), len(groups)
@@ -0,0 +1,80 @@
+"""Полнотекстовый поиск по постам.
+
+На SQLite тексты постов лежат в виртуальной таблице FTS5
+``posts_post_fts`` (rowid = id поста), и поиск идёт по её инвертированному
+индексу с ранжированием bm25. На других базах поиск сводится
+к ``icontains``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+CREATE_FTS_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    "text, tokenize='unicode61 remove_diacritics 2')"
+)
+WORD = re.compile(r'\w+')
+
+
+def is_supported(db=connection):
+    return db.vendor == 'sqlite'
+
+
+def to_match_query(query):
+    """Слова запроса в кавычках: пользовательский ввод не разбирается
+    как синтаксис FTS5, все слова должны встретиться в тексте."""
+    return ' '.join(f'"{word}"' for word in WORD.findall(query))
+
+
+def index_post(post):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+            [post.pk, post.text],
+        )
+
+
+def unindex_post(post_id):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+        )
+
+
+def rebuild(db=connection):
+    """Заполняет индекс заново по таблице постов."""
+    if not is_supported(db):
+        return
+    with db.cursor() as cursor:
+        # Таблицу могли удалить вручную: создаём заново, если её нет.
+        cursor.execute(CREATE_FTS_TABLE)
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) '
+            f'SELECT id, text FROM {Post._meta.db_table}'
+        )
+
+
+def search(queryset, query):
+    """Посты, подходящие под запрос, и порядок для CursorPaginator."""
+    match = to_match_query(query)
+    if not match:
+        return queryset.none(), ('-pub_date', '-id')
+    if not is_supported():
+        for word in WORD.findall(query):
+            queryset = queryset.filter(text__icontains=word)
+        return queryset, ('-pub_date', '-id')
+    return queryset.filter(
+        search_index__text__match=match
+    ).annotate(rank=F('search_index__rank')), ('rank', 'id')
@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import (
+    comments, counters, feed_cache, follows, search, thumbnails, timeline
+)
+from .models import Comment, Follow, Group, Post
+
+
+@receiver(pre_save, sender=Post)
+def post_remember_previous(sender, instance, raw=False, **kwargs):
+    instance._previous = {}
+    if instance.pk is not None and not raw:
+        instance._previous = Post.objects.filter(
+            pk=instance.pk
+        ).values('group_id', 'image', 'text').first() or {}
+
+
+@receiver(post_save, sender=Post)
+def post_fan_out(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        timeline.fan_out(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.change_user_counter(instance.author_id, 'post_count', 1)
+
+
+@receiver(post_delete, sender=Post)
+def post_count_deleted(sender, instance, **kwargs):
+    counters.change_user_counter(instance.author_id, 'post_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.change_comment_counter(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_count_deleted(sender, instance, **kwargs):
+    counters.change_comment_counter(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_invalidate_thread(sender, instance, **kwargs):
+    comments.invalidate(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+def post_invalidate_feeds(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous', {})
+    feed_cache.invalidate(
+        *feed_cache.post_feeds(instance, (previous.get('group_id'),))
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_update_search_index(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous', {})
+    if not raw and instance.text != previous.get('text'):
+        search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_delete_search_index(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def post_pregenerate_thumbnails(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous', {})
+    if raw or not instance.image or (
+        instance.image.name == previous.get('image')
+    ):
+        return
+    image = instance.image
+    transaction.on_commit(lambda: thumbnails.pregenerate(image))
+
+
+@receiver(post_delete, sender=Post)
+def post_delete_invalidate_feeds(sender, instance, **kwargs):
+    feed_cache.invalidate(*feed_cache.post_feeds(instance))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_invalidate_feeds(sender, instance, created=False, **kwargs):
+    if not created:
+        feed_cache.invalidate(feed_cache.ALL_FEEDS)
+
+
+@receiver(post_save, sender=Follow)
+def follow_backfill(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        timeline.backfill(instance.user_id, instance.author_id)
+        counters.change_user_counter(instance.author_id, 'follower_count', 1)
+        counters.change_user_counter(instance.user_id, 'following_count', 1)
+    feed_cache.invalidate(f'follow:{instance.user_id}')
+    follows.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=Follow)
+def unfollow_prune(sender, instance, **kwargs):
+    timeline.prune(instance.user_id, instance.author_id)
+    counters.change_user_counter(instance.author_id, 'follower_count', -1)
+    counters.change_user_counter(instance.user_id, 'following_count', -1)
+    feed_cache.invalidate(f'follow:{instance.user_id}')
+    follows.invalidate(instance.user_id)
@@ -0,0 +1,51 @@
+from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.safestring import mark_safe
+
+from posts import cards, thumbnails
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts, show_author=True):
+    """HTML карточек постов ленты: ``{% post_cards page_obj as cards %}``."""
+    return [mark_safe(card) for card in cards.render(posts, show_author)]
+
+
+class FeedCacheNode(template.Node):
+    def __init__(self, nodelist, timeout, key):
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.key = key
+
+    def render(self, context):
+        key = make_template_fragment_key('feed', [self.key.resolve(context)])
+        value = cache.get(key)
+        if value is None:
+            fallbacks = thumbnails.fallback_count()
+            value = self.nodelist.render(context)
+            # Карточка с исходной картинкой вместо миниатюры не должна
+            # попасть в кеш и на уровне всей ленты.
+            if thumbnails.fallback_count() == fallbacks:
+                cache.set(key, value, self.timeout.resolve(context))
+        return value
+
+
+@register.tag
+def feed_cache(parser, token):
+    """Фрагмент ленты в кеше: ``{% feed_cache cache_timeout cache_key %}``.
+
+    То же, что ``{% cache cache_timeout 'feed' cache_key %}``, но ленту,
+    в которой миниатюра ещё не готова, не кеширует.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' принимает время жизни и ключ."
+        )
+    nodelist = parser.parse(('endfeed_cache',))
+    parser.delete_first_token()
+    timeout, key = (parser.compile_filter(bit) for bit in bits[1:])
+    return FeedCacheNode(nodelist, timeout, key)
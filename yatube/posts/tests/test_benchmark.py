@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import Comment, Follow, Post, TimelineEntry, UserStats
+
+
+class BenchmarkTests(TestCase):
+    def seed(self):
+        call_command(
+            'seed_data', users=5, groups=2, posts=30, comments=10,
+            follows_per_user=2, stdout=StringIO(),
+        )
+
+    def test_seed_data_command(self):
+        """Проверка заполнения базы командой seed_data"""
+        self.seed()
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 10)
+        self.assertEqual(Follow.objects.count(), 10)
+        self.assertTrue(TimelineEntry.objects.exists())
+        self.assertEqual(
+            sum(UserStats.objects.values_list('post_count', flat=True)), 30
+        )
+        self.assertGreater(
+            len(set(Post.objects.values_list('pub_date', flat=True))), 1
+        )
+
+    def test_benchmark_command(self):
+        """Проверка JSON-отчёта команды benchmark"""
+        self.seed()
+        follows = set(Follow.objects.values_list('user', 'author'))
+        texts = set(Post.objects.values_list('text', flat=True))
+        output = StringIO()
+        call_command(
+            'benchmark', requests=2, warmup=0,
+            stdout=output, stderr=StringIO(),
+        )
+        report = json.loads(output.getvalue())
+        self.assertIn('follow_index', report['routes'])
+        index = report['routes']['index']
+        self.assertEqual(index['status_codes'], {'200': 2})
+        for key in ('p50_ms', 'p99_ms', 'throughput_rps', 'queries'):
+            self.assertIn(key, index)
+        self.assertEqual(set(Post.objects.values_list('text', flat=True)),
+                         texts)
+        self.assertEqual(Comment.objects.count(), 10)
+        self.assertEqual(
+            set(Follow.objects.values_list('user', 'author')), follows
+        )
+
+    def test_seed_comments_skip_deleted_posts(self):
+        """Проверка комментариев только к вставленным постам"""
+        self.seed()
+        Post.objects.filter(
+            pk__in=Post.objects.order_by('pk').values('pk')[5:25]
+        ).delete()
+        self.seed()
+        self.assertFalse(Comment.objects.exclude(
+            post__in=Post.objects.values('pk')
+        ).exists())
+
+    def test_benchmark_requires_data(self):
+        """Проверка ошибки команды benchmark на пустой базе"""
+        with self.assertRaises(CommandError):
+            call_command('benchmark', stdout=StringIO())
+
+    def test_benchmark_cache_command(self):
+        """Проверка JSON-отчёта команды benchmark_cache"""
+        output = StringIO()
+        call_command(
+            'benchmark_cache', keys=8, workers=2, operations=20,
+            stdout=output, stderr=StringIO(),
+        )
+        backends = json.loads(output.getvalue())['backends']
+        self.assertEqual(backends['locmem']['shared_hit_ratio'], 0)
+        self.assertEqual(backends['sqlite']['shared_hit_ratio'], 1)
+        self.assertIn('p99_us', backends['filebased']['get_hit'])
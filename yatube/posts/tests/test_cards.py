@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import cards, queries
+from ..models import Group, Post, User
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.author, group=cls.group
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def rendered_cards(self, response):
+        return [
+            template for template in response.templates
+            if template.name == CARD_TEMPLATE
+        ]
+
+    def test_cards_are_reused_between_feeds(self):
+        """Проверка карточек из кеша при новой версии ленты"""
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(len(self.rendered_cards(response)), 3)
+        response = self.client.get(
+            reverse('posts:group_list', args=('group',))
+        )
+        self.assertEqual(self.rendered_cards(response), [])
+        self.assertContains(response, 'Пост 2')
+
+    def test_edit_renders_new_card(self):
+        """Проверка новой карточки после правки поста"""
+        self.client.get(reverse('posts:index'))
+        post = self.posts[0]
+        post.text = 'Правка'
+        post.save()
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(len(self.rendered_cards(response)), 1)
+        self.assertContains(response, 'Правка')
+
+    def test_author_flag_is_part_of_key(self):
+        """Проверка разных карточек для ленты и профиля"""
+        posts = list(queries.index_feed())
+        with_author = cards.render(posts)
+        without_author = cards.render(posts, show_author=False)
+        self.assertIn('все посты пользователя', with_author[0])
+        self.assertNotIn('все посты пользователя', without_author[0])
+
+    def test_thumbnail_fallback_is_not_cached(self):
+        """Проверка карточки с исходной картинкой вне кеша"""
+        posts = list(queries.index_feed()[:1])
+        with mock.patch.object(
+            cards.thumbnails, 'fallback_count', side_effect=[0, 1]
+        ):
+            cards.render(posts)
+        with mock.patch.object(cards, 'get_template') as get_template:
+            get_template.return_value.render.return_value = '<p>Пост</p>'
+            cards.render(posts)
+        get_template.return_value.render.assert_called_once()
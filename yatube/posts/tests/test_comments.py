@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..comments import COMMENTS_PER_PAGE
+from ..models import Comment, Post, User
+
+
+class CommentThreadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(text='Text', author=cls.user)
+        for number in range(COMMENTS_PER_PAGE + 5):
+            Comment.objects.create(
+                post=cls.post, author=cls.user, text=f'Comment {number}'
+            )
+        cls.detail_url = reverse('posts:post_detail', args=(cls.post.pk,))
+        cls.comments_url = reverse(
+            'posts:post_comments', args=(cls.post.pk,)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_detail_shows_first_page(self):
+        """Проверка первой страницы комментариев на странице поста"""
+        response = self.client.get(self.detail_url)
+        comments = response.context['comments']
+        self.assertEqual(len(comments), COMMENTS_PER_PAGE)
+        self.assertEqual(comments[0], Comment.objects.latest('id'))
+        self.assertIsNotNone(response.context['comments_next_cursor'])
+
+    def test_load_more_returns_next_page(self):
+        """Проверка подгрузки следующей страницы в JSON"""
+        first = self.client.get(self.comments_url).json()
+        second = self.client.get(
+            self.comments_url, {'cursor': first['next_cursor']}
+        ).json()
+        self.assertEqual(len(second['comments']), 5)
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(second['comments'][-1]['text'], 'Comment 0')
+        self.assertEqual(
+            second['comments'][0]['author_url'],
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+
+    def test_first_page_is_cached(self):
+        """Проверка кеширования первой страницы комментариев"""
+        self.client.get(self.comments_url)
+        with self.assertNumQueries(1):
+            self.client.get(self.comments_url)
+
+    def test_add_comment_invalidates_cache(self):
+        """Проверка сброса кеша комментариев при добавлении нового"""
+        self.client.get(self.detail_url)
+        self.authorized_client.post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': 'Новый комментарий'},
+        )
+        response = self.client.get(self.comments_url).json()
+        self.assertEqual(
+            response['comments'][0]['text'], 'Новый комментарий'
+        )
+
+    def test_comments_of_missing_post(self):
+        """Проверка ответа 404 для комментариев несуществующего поста"""
+        url = reverse('posts:post_comments', args=(self.post.pk + 100,))
+        self.assertEqual(self.client.get(url).status_code, 404)
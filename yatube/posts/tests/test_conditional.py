@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post, User
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.post = Post.objects.create(
+            text='Текст', author=cls.author, group=cls.group
+        )
+        Follow.objects.create(user=cls.user, author=cls.author)
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(cls.group.slug,)),
+            reverse('posts:profile', args=(cls.author.username,)),
+            reverse('posts:post_detail', args=(cls.post.pk,)),
+            reverse('posts:follow_index'),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def revalidate(self, url, response, client=None):
+        client = client or self.authorized_client
+        return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_pages_return_304(self):
+        """Проверка ответа 304 для неизменившихся страниц"""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertIn('Last-Modified', response)
+                not_modified = self.revalidate(url, response)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_304_does_not_render_templates(self):
+        """Проверка ответа 304 без рендеринга шаблона"""
+        url = self.urls[0]
+        response = self.authorized_client.get(url)
+        not_modified = self.revalidate(url, response)
+        self.assertEqual(not_modified.templates, [])
+
+    def test_post_edit_changes_etag(self):
+        """Проверка смены ETag при правке поста"""
+        responses = {
+            url: self.authorized_client.get(url) for url in self.urls
+        }
+        self.post.text = 'Новый текст'
+        self.post.save()
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.revalidate(url, response).status_code,
+                                 200)
+
+    def test_new_comment_changes_etag(self):
+        """Проверка смены ETag страницы поста при новом комментарии"""
+        url = self.urls[3]
+        response = self.authorized_client.get(url)
+        Comment.objects.create(post=self.post, author=self.user, text='Да')
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_follow_by_other_user_changes_profile_etag(self):
+        """Проверка смены ETag профиля при подписке другого пользователя"""
+        url = self.urls[2]
+        other = User.objects.create_user(username='other')
+        other_client = Client()
+        other_client.force_login(other)
+        response = self.authorized_client.get(url)
+        other_client.get(
+            reverse('posts:profile_follow', args=(self.author.username,))
+        )
+        changed = self.revalidate(url, response)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.context['stats'].follower_count, 2)
+        response = changed
+        Follow.objects.create(user=self.author, author=other)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_etag_depends_on_user(self):
+        """Проверка разных ETag для гостя и пользователя"""
+        url = self.urls[0]
+        response = self.authorized_client.get(url)
+        guest = self.revalidate(url, response, self.client)
+        self.assertEqual(guest.status_code, 200)
+
+    def test_cache_control(self):
+        """Проверка Cache-Control для гостя и пользователя"""
+        url = self.urls[0]
+        response = self.client.get(url)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        response = self.authorized_client.get(url)
+        self.assertEqual(
+            sorted(response['Cache-Control'].split(', ')),
+            ['no-cache', 'private'],
+        )
+
+    def test_updated_at_changes_on_save(self):
+        """Проверка обновления времени правки поста"""
+        updated_at = self.post.updated_at
+        self.post.save()
+        self.post.refresh_from_db()
+        self.assertGreater(self.post.updated_at, updated_at)
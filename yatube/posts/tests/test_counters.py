@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Post, User, Comment, Follow, UserStats
+
+
+class CountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+
+    def stats(self, user):
+        return UserStats.objects.get(user=user)
+
+    def test_post_counter(self):
+        """Проверка счётчика постов автора"""
+        post = Post.objects.create(text='Text', author=self.author)
+        Post.objects.create(text='Text', author=self.author)
+        self.assertEqual(self.stats(self.author).post_count, 2)
+        post.delete()
+        self.assertEqual(self.stats(self.author).post_count, 1)
+
+    def test_comment_counter(self):
+        """Проверка счётчика комментариев поста"""
+        post = Post.objects.create(text='Text', author=self.author)
+        comment = Comment.objects.create(
+            post=post, author=self.user, text='Comment'
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+        comment.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 0)
+
+    def test_follow_counters(self):
+        """Проверка счётчиков подписчиков и подписок"""
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        self.assertEqual(self.stats(self.author).follower_count, 1)
+        self.assertEqual(self.stats(self.user).following_count, 1)
+        follow.delete()
+        self.assertEqual(self.stats(self.author).follower_count, 0)
+        self.assertEqual(self.stats(self.user).following_count, 0)
+
+    def test_reconcile_counters_command(self):
+        """Проверка исправления расхождений командой reconcile_counters"""
+        post = Post.objects.create(text='Text', author=self.author)
+        Comment.objects.create(post=post, author=self.user, text='Comment')
+        Follow.objects.create(user=self.user, author=self.author)
+        UserStats.objects.update(
+            post_count=10, follower_count=10, following_count=10
+        )
+        Post.objects.update(comment_count=10)
+        call_command('reconcile_counters', stdout=StringIO())
+        author_stats = self.stats(self.author)
+        self.assertEqual(author_stats.post_count, 1)
+        self.assertEqual(author_stats.follower_count, 1)
+        self.assertEqual(self.stats(self.user).following_count, 1)
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
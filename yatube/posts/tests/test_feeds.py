@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..feeds import GroupPostsFeed
+from ..models import Group, Post, User
+
+
+class SyndicationFeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            text='Текст поста', author=cls.author, group=cls.group
+        )
+        cls.urls = (
+            reverse('posts:feed'),
+            reverse('posts:feed_atom'),
+            reverse('posts:group_feed', args=(cls.group.slug,)),
+            reverse('posts:group_feed_atom', args=(cls.group.slug,)),
+            reverse('posts:profile_feed', args=(cls.author.username,)),
+            reverse('posts:profile_feed_atom', args=(cls.author.username,)),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_contain_posts(self):
+        """Проверка содержимого RSS и Atom лент"""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Текст поста', response.content.decode())
+                self.assertIn('ETag', response)
+                self.assertIn('Last-Modified', response)
+        self.assertIn(
+            'application/atom+xml',
+            self.client.get(reverse('posts:feed_atom'))['Content-Type'],
+        )
+
+    def test_not_modified(self):
+        """Проверка ответа 304 только по ETag"""
+        response = self.client.get(self.urls[0])
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                self.urls[0], HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        response = self.client.get(
+            self.urls[0], HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_feed_skips_rendering(self):
+        """Проверка выдачи собранной ленты из кеша"""
+        self.client.get(self.urls[0])
+        with self.assertNumQueries(1):
+            response = self.client.get(self.urls[0])
+        self.assertIn('Текст поста', response.content.decode())
+
+    def test_etag_changes_on_post_edit(self):
+        """Проверка смены ETag при правке поста"""
+        response = self.client.get(self.urls[0])
+        self.post.text = 'Новый текст'
+        self.post.save()
+        for header, value in (
+            ('HTTP_IF_NONE_MATCH', response['ETag']),
+            ('HTTP_IF_MODIFIED_SINCE', response['Last-Modified']),
+        ):
+            with self.subTest(header=header):
+                edited = self.client.get(self.urls[0], **{header: value})
+                self.assertEqual(edited.status_code, 200)
+                self.assertIn('Новый текст', edited.content.decode())
+
+    def test_cache_depends_on_host_and_scheme(self):
+        """Проверка ссылок ленты для разных хостов и схем"""
+        link = reverse('posts:post_detail', args=(self.post.pk,))
+        for host, secure, expected in (
+            ('localhost', False, f'http://localhost{link}'),
+            ('127.0.0.1', False, f'http://127.0.0.1{link}'),
+            ('localhost', True, f'https://localhost{link}'),
+        ):
+            with self.subTest(host=host, secure=secure):
+                response = self.client.get(
+                    self.urls[0], HTTP_HOST=host, secure=secure
+                )
+                self.assertIn(expected, response.content.decode())
+
+    def test_object_loaded_once(self):
+        """Проверка однократной загрузки группы ленты"""
+        with mock.patch.object(
+            GroupPostsFeed, 'get_object', autospec=True,
+            side_effect=GroupPostsFeed.get_object,
+        ) as get_object:
+            self.client.get(self.urls[2])
+        get_object.assert_called_once()
+
+    def test_unknown_group_feed(self):
+        """Проверка ответа 404 для ленты несуществующей группы"""
+        response = self.client.get(
+            reverse('posts:group_feed', args=('missing',))
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import follows
+from ..models import Follow, User
+
+
+class FollowStateTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.profile_url = reverse('posts:profile', args=('author',))
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_follow_redirects_to_profile(self):
+        """Проверка редиректа на профиль после подписки и отписки"""
+        for name in ('posts:profile_follow', 'posts:profile_unfollow'):
+            with self.subTest(name=name):
+                response = self.authorized_client.get(
+                    reverse(name, args=('author',))
+                )
+                self.assertRedirects(response, self.profile_url)
+        response = self.authorized_client.get(
+            reverse('posts:profile_follow', args=('nobody',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_following_state_on_profile(self):
+        """Проверка состояния подписки на странице профиля"""
+        response = self.authorized_client.get(self.profile_url)
+        self.assertFalse(response.context['following'])
+        self.authorized_client.get(
+            reverse('posts:profile_follow', args=('author',))
+        )
+        response = self.authorized_client.get(self.profile_url)
+        self.assertTrue(response.context['following'])
+        Follow.objects.filter(user=self.user).delete()
+        response = self.authorized_client.get(self.profile_url)
+        self.assertFalse(response.context['following'])
+
+    def test_followed_ids_are_cached(self):
+        """Проверка кеширования множества авторов подписок"""
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertEqual(follows.followed_ids(self.user), {self.author.pk})
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(follows.is_following(user, self.author.pk))
+            self.assertFalse(follows.is_following(user, self.user.pk))
@@ -0,0 +1,114 @@
+import io
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..forms import PostForm
+from ..images import output_format
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+ORIENTATION = 0x0112
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def upload(name, image, image_format, **options):
+    content = io.BytesIO()
+    image.save(content, image_format, **options)
+    return SimpleUploadedFile(name, content.getvalue())
+
+
+@override_settings(
+    MEDIA_ROOT=TEMP_MEDIA_ROOT, THUMBNAIL_WORKERS=0, IMAGE_MAX_SIDE=100
+)
+class ImageIngestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def save(self, image):
+        form = PostForm(
+            data={'text': 'Пост'}, files={'image': image},
+            instance=Post(author=self.user),
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def errors(self, image):
+        form = PostForm(data={'text': 'Пост'}, files={'image': image})
+        self.assertFalse(form.is_valid())
+        return form.errors['image']
+
+    def test_photo_is_downscaled_and_stripped(self):
+        """Проверка уменьшения, поворота и удаления EXIF у фото"""
+        exif = Image.Exif()
+        exif[ORIENTATION] = 6
+        post = self.save(upload(
+            'photo.jpg', Image.new('RGB', (400, 200), 'red'), 'JPEG',
+            exif=exif.tobytes(),
+        ))
+        extension = output_format(False).lower().replace('jpeg', 'jpg')
+        self.assertEqual(post.image.name, f'posts/photo.{extension}')
+        self.assertEqual((post.image_width, post.image_height), (50, 100))
+        with Image.open(post.image.path) as stored:
+            self.assertEqual(stored.size, (50, 100))
+            self.assertNotIn('exif', stored.info)
+
+    def test_transparency_is_kept(self):
+        """Проверка сохранения прозрачности"""
+        post = self.save(upload(
+            'logo.png', Image.new('RGBA', (300, 300), (0, 0, 0, 0)), 'PNG'
+        ))
+        with Image.open(post.image.path) as stored:
+            self.assertIn('A', stored.getbands())
+            self.assertEqual(stored.size, (100, 100))
+
+    def test_small_image_is_kept(self):
+        """Проверка, что компактная картинка сохраняется как есть"""
+        post = self.save(SimpleUploadedFile('small.gif', SMALL_GIF))
+        self.assertEqual(post.image.name, 'posts/small.gif')
+        self.assertEqual((post.image_width, post.image_height), (2, 1))
+
+    def test_limits(self):
+        """Проверка ограничений размера файла и разрешения"""
+        image = Image.new('RGB', (200, 200))
+        with override_settings(IMAGE_MAX_UPLOAD_SIZE=10):
+            errors = self.errors(upload('a.png', image, 'PNG'))
+            self.assertEqual(len(errors), 1)
+        with override_settings(IMAGE_MAX_PIXELS=100):
+            self.assertIn(
+                '200×200', self.errors(upload('a.png', image, 'PNG'))[0]
+            )
+
+    def test_truncated_image_is_rejected(self):
+        """Проверка ошибки формы для обрезанного JPEG"""
+        content = upload('a.jpg', Image.new('RGB', (200, 200)), 'JPEG').read()
+        image = SimpleUploadedFile('a.jpg', content[:len(content) // 2])
+        self.assertEqual(len(self.errors(image)), 1)
+
+    def test_clearing_image_resets_size(self):
+        """Проверка сброса размеров при удалении картинки"""
+        post = self.save(upload('a.png', Image.new('RGB', (10, 10)), 'PNG'))
+        form = PostForm(
+            data={'text': 'Пост', 'image-clear': 'on'}, instance=post
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save()
+        self.assertFalse(post.image)
+        self.assertIsNone(post.image_width)
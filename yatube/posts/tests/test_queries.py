@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from ..models import Post, Group, User, Follow, Comment
+
+
+class QueryBudgetTests(TestCase):
+    """Число запросов представления не зависит от числа постов на странице.
+
+    Бюджеты заданы для заполненной страницы из постов разных авторов
+    и групп: если шаблон начнёт обращаться к незагруженной связи,
+    запросов станет больше и тест упадёт. Один запрос в каждом бюджете —
+    валидаторы условного GET.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.authors = [
+            User.objects.create_user(username=f'author{number}')
+            for number in range(3)
+        ]
+        cls.groups = [
+            Group.objects.create(title=f'group {number}', slug=f'g{number}')
+            for number in range(2)
+        ]
+        for author in cls.authors:
+            Follow.objects.create(user=cls.user, author=author)
+        for number in range(12):
+            post = Post.objects.create(
+                text=f'Post {number}',
+                author=cls.authors[number % 3],
+                group=cls.groups[number % 2],
+            )
+            Comment.objects.create(
+                post=post, author=cls.authors[number % 3], text='Comment'
+            )
+        cls.post = post
+        cls.budgets = {
+            reverse('posts:index'): 4,
+            reverse(
+                'posts:group_list', kwargs={'slug': cls.groups[0].slug}
+            ): 5,
+            reverse(
+                'posts:profile', kwargs={'username': cls.authors[0].username}
+            ): 6,
+            reverse('posts:post_detail', kwargs={'post_id': cls.post.pk}): 5,
+            reverse('posts:follow_index'): 4,
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_views_query_budget(self):
+        """Проверка фиксированного числа запросов для страниц"""
+        for url, budget in self.budgets.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(budget):
+                    self.authorized_client.get(url)
+
+
+class FeedIndexesTests(TestCase):
+    def test_feed_queries_use_indexes(self):
+        """Проверка планов запросов лент командой explain_feeds"""
+        call_command('explain_feeds', stdout=StringIO())
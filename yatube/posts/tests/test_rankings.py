@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import rankings
+from ..models import (
+    Comment, Group, PopularGroup, Post, TrendingPost, User
+)
+
+
+class RankingsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+        cls.groups = [
+            Group.objects.create(title=f'Группа {number}', slug=f'g{number}')
+            for number in range(3)
+        ]
+        cls.fresh = Post.objects.create(
+            text='Свежее обсуждение', author=cls.user, group=cls.groups[0]
+        )
+        cls.stale = Post.objects.create(
+            text='Старое обсуждение', author=cls.user, group=cls.groups[1]
+        )
+        cls.quiet = Post.objects.create(
+            text='Без комментариев', author=cls.user, group=cls.groups[1]
+        )
+        for post in (cls.fresh, cls.stale):
+            for _ in range(3):
+                Comment.objects.create(post=post, author=cls.user, text='К')
+        Comment.objects.filter(post=cls.stale).update(
+            created=timezone.now() - timedelta(days=2)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_decay_orders_posts(self):
+        """Проверка затухания: свежие комментарии весят больше старых"""
+        ranking = rankings.trending_posts(timezone.now())
+        self.assertEqual(
+            [post_id for post_id, _ in ranking],
+            [self.fresh.pk, self.stale.pk],
+        )
+        self.assertAlmostEqual(ranking[1][1], 0.75, places=1)
+
+    def test_window_and_size(self):
+        """Проверка окна событий и размера рейтинга"""
+        now = timezone.now()
+        self.assertEqual(
+            len(rankings.trending_posts(now, window=timedelta(days=1))), 1
+        )
+        self.assertEqual(len(rankings.trending_posts(now, size=1)), 1)
+
+    def test_command_stores_rankings(self):
+        """Проверка сохранения рейтингов командой"""
+        call_command('update_rankings', stdout=StringIO())
+        self.assertEqual(
+            list(TrendingPost.objects.values_list('post_id', 'rank')),
+            [(self.fresh.pk, 1), (self.stale.pk, 2)],
+        )
+        self.assertEqual(
+            list(PopularGroup.objects.values_list('group_id', flat=True)),
+            [self.groups[1].pk, self.groups[0].pk],
+        )
+        call_command('update_rankings', top=1, stdout=StringIO())
+        self.assertEqual(TrendingPost.objects.count(), 1)
+
+    def test_pages_read_stored_rankings(self):
+        """Проверка страниц рейтингов из сохранённых таблиц"""
+        rankings.update()
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['posts']), [self.fresh, self.stale]
+        )
+        response = self.client.get(reverse('posts:popular_groups'))
+        self.assertEqual(
+            list(response.context['groups']),
+            [self.groups[1], self.groups[0]],
+        )
+
+    def test_cached_pages_skip_queries(self):
+        """Проверка страниц рейтингов без запросов при тёплом кеше"""
+        rankings.update()
+        for name in ('posts:trending', 'posts:popular_groups'):
+            with self.subTest(name=name):
+                url = reverse(name)
+                self.client.get(url)
+                with self.assertNumQueries(0):
+                    self.client.get(url)
+
+    def test_update_refreshes_cached_pages(self):
+        """Проверка обновления страницы после пересчёта рейтинга"""
+        self.client.get(reverse('posts:trending'))
+        rankings.update()
+        response = self.client.get(reverse('posts:trending'))
+        self.assertContains(response, 'Свежее обсуждение')
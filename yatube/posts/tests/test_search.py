@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from .. import search
+from ..models import Post, User
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth', is_staff=True,
+                                            is_superuser=True)
+        cls.post_cat = Post.objects.create(
+            text='Кот спит на диване', author=cls.user
+        )
+        cls.post_cats = Post.objects.create(
+            text='Кот и ещё кот, коты повсюду', author=cls.user
+        )
+        cls.post_dog = Post.objects.create(
+            text='Собака гуляет', author=cls.user
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def search(self, query, **params):
+        response = self.client.get(
+            reverse('posts:search'), {'q': query, **params}
+        )
+        return response.context['page_obj']
+
+    def test_search_finds_matching_posts_by_rank(self):
+        """Проверка поиска и ранжирования результатов"""
+        self.assertEqual(
+            list(self.search('кот')), [self.post_cats, self.post_cat]
+        )
+        self.assertEqual(list(self.search('собака')), [self.post_dog])
+        self.assertEqual(list(self.search('"кот*')), [
+            self.post_cats, self.post_cat
+        ])
+        self.assertEqual(list(self.search('')), [])
+
+    def test_search_index_follows_post_changes(self):
+        """Проверка обновления индекса при изменении и удалении поста"""
+        self.post_dog.text = 'Кот вместо собаки'
+        self.post_dog.save()
+        self.assertIn(self.post_dog, self.search('кот'))
+        self.assertEqual(list(self.search('гуляет')), [])
+        self.post_dog.delete()
+        self.assertNotIn(self.post_dog, self.search('кот'))
+
+    def test_rebuild_recreates_missing_table(self):
+        """Проверка пересоздания удалённого индекса"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {search.FTS_TABLE}')
+        search.rebuild()
+        self.assertEqual(list(self.search('собака')), [self.post_dog])
+
+    def test_search_pagination(self):
+        """Проверка постраничного вывода результатов поиска"""
+        for number in range(12):
+            Post.objects.create(text=f'Кот номер {number}', author=self.user)
+        first_page = self.search('кот')
+        self.assertEqual(len(first_page), 10)
+        response = self.client.get(reverse('posts:search'), {
+            'q': 'кот', 'cursor': first_page.next_cursor
+        })
+        self.assertContains(response, '?q=')
+        second_page = response.context['page_obj']
+        self.assertEqual(len(second_page), 4)
+        self.assertFalse(set(first_page) & set(second_page))
+
+    def test_admin_search_uses_index(self):
+        """Проверка поиска постов в админке"""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'собака'}
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post_dog]
+        )
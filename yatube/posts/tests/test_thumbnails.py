@@ -0,0 +1,139 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+
+from .. import thumbnails
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ThumbnailsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            text='Test text',
+            author=self.user,
+            image=SimpleUploadedFile(
+                name='small.gif', content=SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        self.geometry, self.options = thumbnails.POST_THUMBNAILS[0]
+
+    def test_source_image_until_thumbnail_ready(self):
+        """Проверка показа исходной картинки, пока миниатюра не готова"""
+        with mock.patch.object(
+            thumbnails, 'schedule', return_value=False
+        ) as schedule:
+            image = get_thumbnail(
+                self.post.image, self.geometry, **self.options
+            )
+        self.assertEqual(image.url, self.post.image.url)
+        schedule.assert_called_once()
+
+    @override_settings(THUMBNAIL_WORKERS=0)
+    def test_pregenerate_builds_thumbnail(self):
+        """Проверка подготовки миниатюры заранее"""
+        thumbnails.pregenerate(self.post.image)
+        with mock.patch.object(thumbnails, 'schedule') as schedule:
+            image = get_thumbnail(
+                self.post.image, self.geometry, **self.options
+            )
+        schedule.assert_not_called()
+        self.assertNotEqual(image.url, self.post.image.url)
+        self.assertEqual((image.width, image.height), (960, 339))
+
+    def test_names_match_sorl(self):
+        """Проверка совпадения имён миниатюр с именами sorl-thumbnail"""
+        backend = thumbnails.DeferredThumbnailBackend()
+        variants = [*thumbnails.POST_THUMBNAILS, ('100x100', {
+            'format': 'PNG', 'quality': 50, 'padding': True,
+        })]
+        for preserve_format in (False, True):
+            for geometry, options in variants:
+                with self.subTest(geometry=geometry), override_settings(
+                    THUMBNAIL_PRESERVE_FORMAT=preserve_format
+                ):
+                    _, thumbnail = backend._prepare(
+                        self.post.image, geometry, dict(options)
+                    )
+                    expected = ThumbnailBackend().get_thumbnail(
+                        self.post.image, geometry, **options
+                    )
+                    self.assertEqual(thumbnail.name, expected.name)
+
+    @override_settings(THUMBNAIL_WORKERS=1)
+    def test_render_in_worker_process(self):
+        """Проверка построения миниатюры в процессе пула"""
+        backend = thumbnails.DeferredThumbnailBackend()
+        options = dict(self.options)
+        source, thumbnail = backend._prepare(
+            self.post.image, self.geometry, options
+        )
+        future = thumbnails._get_executor().submit(
+            thumbnails.render, TEMP_MEDIA_ROOT, source.name,
+            thumbnail.name, self.geometry, options,
+        )
+        future.result(timeout=30)
+        self.assertTrue(thumbnail.exists())
+
+    @override_settings(THUMBNAIL_WORKERS=1)
+    def test_broken_pool_is_recreated(self):
+        """Проверка замены упавшего пула миниатюр"""
+        broken = mock.Mock()
+        broken.submit.side_effect = thumbnails.BrokenProcessPool()
+        with mock.patch.object(thumbnails, '_executor', broken):
+            self.assertFalse(thumbnails.schedule(
+                'posts/small.gif', 'cache/thumb.gif', self.geometry, {}
+            ))
+            self.assertIsNone(thumbnails._executor)
+        broken.shutdown.assert_called_once_with(wait=False)
+        self.assertNotIn('cache/thumb.gif', thumbnails._pending)
+
+    def test_page_with_source_image_has_no_etag(self):
+        """Проверка, что страница с исходной картинкой не получает ETag"""
+        with mock.patch.object(thumbnails, 'schedule', return_value=False):
+            response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, self.post.image.url)
+        self.assertNotIn('ETag', response)
+        with override_settings(THUMBNAIL_WORKERS=0):
+            response = self.client.get(reverse('posts:index'))
+        self.assertIn('ETag', response)
+
+    def test_feed_with_source_image_is_not_cached(self):
+        """Проверка, что лента с исходной картинкой не попадает в кеш"""
+        cache.clear()
+        with mock.patch.object(thumbnails, 'schedule', return_value=False):
+            response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, self.post.image.url)
+        with override_settings(THUMBNAIL_WORKERS=0):
+            response = self.client.get(reverse('posts:index'))
+        self.assertNotContains(response, self.post.image.url)
+        self.assertContains(response, 'Test text')
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import timeline
+from ..models import Post, User, Follow, TimelineEntry
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(text='Old text', author=cls.author)
+
+    def timeline_posts(self):
+        return list(
+            TimelineEntry.objects.filter(
+                user=self.user
+            ).values_list('post_id', flat=True)
+        )
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        """Проверка заполнения ленты при подписке и очистки при отписке"""
+        follow = Follow.objects.create(user=self.user, author=self.author)
+        self.assertEqual(self.timeline_posts(), [self.post.pk])
+        follow.delete()
+        self.assertEqual(self.timeline_posts(), [])
+
+    def test_new_post_fans_out_to_followers(self):
+        """Проверка попадания нового поста в ленты подписчиков"""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = Post.objects.create(text='New text', author=self.author)
+        self.assertIn(post.pk, self.timeline_posts())
+        entry = TimelineEntry.objects.get(user=self.user, post=post)
+        self.assertEqual(entry.pub_date, post.pub_date)
+
+    def test_rebuild_timelines_command(self):
+        """Проверка пересборки лент командой rebuild_timelines"""
+        Follow.objects.create(user=self.user, author=self.author)
+        TimelineEntry.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(self.timeline_posts(), [self.post.pk])
+
+    def test_rebuild_does_not_query_per_follow(self):
+        """Проверка пересборки лент без запросов на каждую подписку"""
+        for number in range(3):
+            Follow.objects.create(
+                user=User.objects.create_user(username=f'user{number}'),
+                author=self.author,
+            )
+        with self.assertNumQueries(2):
+            self.assertEqual(timeline.rebuild(), 3)
+        entry = TimelineEntry.objects.get(
+            user__username='user0', post=self.post
+        )
+        self.assertEqual(entry.author_id, self.author.pk)
+        self.assertEqual(entry.pub_date, self.post.pub_date)
@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Comment, Follow, Group, Post, User, UserStats
+
+
+class TransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.author = User.objects.create_user(username='author')
+        self.reader = User.objects.create_user(username='reader')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        self.post = Post.objects.create(
+            text='Пост', author=self.author, group=self.group
+        )
+        Post.objects.create(text='Без группы', author=self.author)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def export(self, model, file_format='jsonl'):
+        path = self.path(f'{model}.{file_format}')
+        call_command(
+            'export_data', model, output=path, format=file_format,
+            stderr=StringIO(),
+        )
+        return path
+
+    def load(self, model, path, **options):
+        stderr = StringIO()
+        call_command(
+            'import_data', model, path,
+            stdout=StringIO(), stderr=stderr, **options,
+        )
+        return stderr.getvalue()
+
+    def test_round_trip(self):
+        """Проверка выгрузки и загрузки всех моделей в JSONL и CSV"""
+        for file_format in ('jsonl', 'csv'):
+            with self.subTest(format=file_format):
+                paths = {
+                    model: self.export(model, file_format)
+                    for model in ('groups', 'posts', 'comments', 'follows')
+                }
+                post_dates = list(Post.objects.values_list('pub_date'))
+                Group.objects.all().delete()
+                Post.objects.all().delete()
+                Follow.objects.all().delete()
+                for model, path in paths.items():
+                    self.load(model, path)
+                self.assertEqual(Group.objects.get().description, 'Описание')
+                self.assertEqual(
+                    Post.objects.get(pk=self.post.pk).group.slug, 'group'
+                )
+                self.assertTrue(Post.objects.filter(group=None).exists())
+                self.assertEqual(
+                    list(Post.objects.values_list('pub_date')), post_dates
+                )
+                self.assertEqual(Comment.objects.get().post_id, self.post.pk)
+                self.assertTrue(Follow.objects.filter(
+                    user=self.reader, author=self.author
+                ).exists())
+                self.assertEqual(
+                    UserStats.objects.get(user=self.author).post_count, 2
+                )
+
+    def test_import_is_idempotent(self):
+        """Проверка повторной загрузки без дублей"""
+        path = self.export('posts')
+        self.load('posts', path)
+        self.load('posts', path)
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_refresh_only_affected_data(self):
+        """Проверка пересборки только затронутых производных данных"""
+        log = self.load('comments', self.export('comments'))
+        self.assertIn('Счётчики', log)
+        self.assertNotIn('Ленты подписок', log)
+        self.assertNotIn('Поисковый индекс', log)
+        log = self.load('posts', self.export('posts'))
+        self.assertIn('Ленты подписок', log)
+        self.assertIn('Поисковый индекс', log)
+
+    def test_taken_ids_are_not_merged(self):
+        """Проверка загрузки в базу, где id поста занят другим постом"""
+        posts = self.export('posts')
+        comments = self.export('comments')
+        Post.objects.all().delete()
+        local = Post.objects.create(
+            pk=self.post.pk, text='Чужой пост', author=self.reader
+        )
+        log = self.load('posts', posts) + self.load('comments', comments)
+        local.refresh_from_db()
+        self.assertEqual(local.text, 'Чужой пост')
+        self.assertFalse(Comment.objects.filter(post=local).exists())
+        self.assertTrue(Post.objects.filter(text='Без группы').exists())
+        self.assertIn(f'занят другой записью: {self.post.pk}', log)
+
+    def test_unknown_references_are_skipped(self):
+        """Проверка пропуска строк с неизвестным автором"""
+        path = self.path('posts.jsonl')
+        with open(path, 'w') as output:
+            for author in ('author', 'nobody'):
+                output.write(json.dumps({'text': 'Новый', 'author': author}))
+                output.write('\n')
+        self.load('posts', path, skip_refresh=True)
+        self.assertEqual(Post.objects.filter(text='Новый').count(), 1)
+
+    def test_resume_skips_loaded_rows(self):
+        """Проверка продолжения загрузки с сохранённой позиции"""
+        path = self.path('posts.jsonl')
+        with open(path, 'w') as output:
+            for number in range(3):
+                output.write(json.dumps(
+                    {'text': f'Пост {number}', 'author': 'author'}
+                ) + '\n')
+        with open(f'{path}.progress', 'w') as progress:
+            progress.write('2')
+        self.load('posts', path, resume=True, skip_refresh=True)
+        self.assertEqual(
+            list(Post.objects.filter(
+                text__startswith='Пост '
+            ).values_list('text', flat=True)),
+            ['Пост 2'],
+        )
+        self.assertFalse(os.path.exists(f'{path}.progress'))
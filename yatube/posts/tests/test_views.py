@@ -12,7 +12,7 @@ from ..models import Post, Group, User, Follow
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, THUMBNAIL_WORKERS=0)
 class PostsPagesTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -187,14 +187,45 @@ class PostsPagesTests(TestCase):
         cache.clear()
         response = self.authorized_client.get(reverse('posts:index'))
         cache_check = response.content
-        post = Post.objects.get(pk=1)
-        post.delete()
+        Post.objects.filter(pk=1).update(text='Text without signals')
         response = self.authorized_client.get(reverse('posts:index'))
         self.assertEqual(response.content, cache_check)
         cache.clear()
         response = self.authorized_client.get(reverse('posts:index'))
         self.assertNotEqual(response.content, cache_check)
 
+    def test_cache_invalidated_on_post_change(self):
+        """Тестирование сброса кеша лент при изменении поста"""
+        cache.clear()
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse(
+                'posts:profile', kwargs={'username': self.user_auth.username}
+            ),
+        )
+        for url in urls:
+            self.authorized_client.get(url)
+        post = Post.objects.get(pk=1)
+        post.text = 'Changed text'
+        post.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertContains(response, 'Changed text')
+        post.delete()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                self.assertNotContains(response, 'Changed text')
+
+    def test_cache_varies_on_auth_state(self):
+        """Тестирование разных фрагментов для гостя и пользователя"""
+        cache.clear()
+        self.authorized_client.get(reverse('posts:index'))
+        response = Client().get(reverse('posts:index'))
+        self.assertNotContains(response, 'Избранные авторы')
+
     def test_follow_correct(self):
         """Тестирование возможности подписки и отписки"""
         self.authorized_client.get(
@@ -292,15 +323,47 @@ class PaginatorViewsTest(TestCase):
     def test_second_page_contains_three_posts(self):
         """Проверка что на второй странице 3 записи"""
         templates_page_names = {
-            reverse('posts:index') + '?page=2': self.cnt_second_page,
+            reverse('posts:index'): self.cnt_second_page,
             reverse(
                 'posts:group_list', kwargs={'slug': self.group.slug}
-            ) + '?page=2': self.cnt_second_page,
+            ): self.cnt_second_page,
             reverse(
                 'posts:profile', kwargs={'username': self.user_auth.username}
-            ) + '?page=2': self.cnt_second_page,
+            ): self.cnt_second_page,
         }
         for reverse_name, count in templates_page_names.items():
             with self.subTest(reverse_name=reverse_name):
                 response = self.authorized_client.get(reverse_name)
-                self.assertEqual(len(response.context['page_obj']), count)
+                cursor = response.context['page_obj'].next_cursor
+                self.assertIsNotNone(cursor)
+                response = self.authorized_client.get(
+                    reverse_name, {'cursor': cursor}
+                )
+                page_obj = response.context['page_obj']
+                self.assertEqual(len(page_obj), count)
+                self.assertIsNone(page_obj.next_cursor)
+                self.assertIsNotNone(page_obj.previous_cursor)
+
+    def test_previous_page_returns_first_page(self):
+        """Проверка перехода на предыдущую страницу по курсору"""
+        url = reverse('posts:index')
+        first_page = self.authorized_client.get(url).context['page_obj']
+        response = self.authorized_client.get(
+            url, {'cursor': first_page.next_cursor}
+        )
+        response = self.authorized_client.get(
+            url, {'cursor': response.context['page_obj'].previous_cursor}
+        )
+        page_obj = response.context['page_obj']
+        self.assertEqual(list(page_obj), list(first_page))
+        self.assertIsNone(page_obj.previous_cursor)
+        self.assertIsNotNone(page_obj.next_cursor)
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Проверка что неверный курсор открывает первую страницу"""
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'cursor': 'not-a-cursor'}
+        )
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), self.cnt_first_page)
+        self.assertIsNone(page_obj.previous_cursor)
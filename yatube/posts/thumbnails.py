@@ -0,0 +1,169 @@
+"""Фоновая подготовка миниатюр картинок постов.
+
+Бэкенд sorl-thumbnail ``DeferredThumbnailBackend`` не строит миниатюру
+в запросе: пока файла нет, ``{% thumbnail %}`` отдаёт исходную картинку,
+а задача уходит в пул процессов. Процесс пула только читает исходник
+и пишет миниатюру на диск, в базу он не ходит; запись в kvstore sorl
+делает первый запрос, увидевший готовый файл.
+
+Имя миниатюры до её построения и само построение sorl публично не
+предоставляет, поэтому бэкенд вызывает его внутренние методы. Версия
+sorl-thumbnail закреплена в requirements.txt, а тест сверяет имена
+с ``ThumbnailBackend.get_thumbnail``: после обновления sorl расхождение
+проявится в тестах, а не в шаблонах.
+"""
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.images import ImageFile
+
+logger = logging.getLogger(__name__)
+
+# Миниатюры, которые выводят шаблоны лент и страницы поста.
+POST_THUMBNAILS = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _init_worker():
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS,
+            initializer=_init_worker,
+        )
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def render(media_root, source_name, thumbnail_name, geometry, options):
+    """Строит миниатюру; выполняется в процессе пула."""
+    storage = FileSystemStorage(location=media_root)
+    thumbnail = ImageFile(thumbnail_name, storage)
+    if thumbnail.exists():
+        return
+    source_image = default.engine.get_image(ImageFile(source_name, storage))
+    try:
+        options['image_info'] = default.engine.get_image_info(source_image)
+        ThumbnailBackend()._create_thumbnail(
+            source_image, geometry, options, thumbnail
+        )
+    finally:
+        default.engine.cleanup(source_image)
+
+
+def _done(thumbnail_name, future):
+    with _lock:
+        _pending.discard(thumbnail_name)
+    if future.exception() is not None:
+        logger.error(
+            'Не удалось построить миниатюру %s', thumbnail_name,
+            exc_info=future.exception(),
+        )
+
+
+def schedule(source_name, thumbnail_name, geometry, options):
+    """Ставит миниатюру в очередь; при THUMBNAIL_WORKERS = 0 строит сразу.
+
+    Возвращает True, если миниатюра уже построена.
+    """
+    args = (settings.MEDIA_ROOT, source_name, thumbnail_name, geometry,
+            options)
+    if not settings.THUMBNAIL_WORKERS:
+        render(*args)
+        return True
+    with _lock:
+        if thumbnail_name in _pending:
+            return False
+        _pending.add(thumbnail_name)
+    try:
+        future = _get_executor().submit(render, *args)
+    except BrokenProcessPool:
+        # Процесс пула упал: следующий вызов создаст новый пул,
+        # а пока показывается исходная картинка.
+        _reset_executor()
+        with _lock:
+            _pending.discard(thumbnail_name)
+        logger.error('Пул миниатюр сломан, создаётся заново')
+        return False
+    future.add_done_callback(lambda future: _done(thumbnail_name, future))
+    return False
+
+
+def _exists(image_file):
+    try:
+        return image_file.exists()
+    except (SuspiciousFileOperation, OSError):
+        return False
+
+
+def fallback_count():
+    """Сколько раз в этом потоке вместо миниатюры отдан исходник."""
+    return getattr(_local, 'fallbacks', 0)
+
+
+def pregenerate(image):
+    """Ставит в очередь все миниатюры, нужные шаблонам для картинки."""
+    backend = default.backend
+    for geometry, options in POST_THUMBNAILS:
+        backend.get_thumbnail(image, geometry, **options)
+
+
+class DeferredThumbnailBackend(ThumbnailBackend):
+    def _prepare(self, file_, geometry_string, options):
+        """Повторяет разбор параметров ``ThumbnailBackend.get_thumbnail``."""
+        source = ImageFile(file_)
+        if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(sorl_settings, attr)
+            if value != getattr(sorl_defaults, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return source, ImageFile(name, default.storage)
+
+    def get_thumbnail(self, file_, geometry_string, **options):
+        if not file_:
+            raise ValueError('falsey file_ argument in get_thumbnail()')
+        if not isinstance(default.storage, FileSystemStorage):
+            return super().get_thumbnail(file_, geometry_string, **options)
+        source, thumbnail = self._prepare(file_, geometry_string, options)
+        cached = default.kvstore.get(thumbnail)
+        if cached:
+            return cached
+        if not thumbnail.exists():
+            if not _exists(source) or not schedule(
+                source.name, thumbnail.name, geometry_string, options
+            ):
+                _local.fallbacks = fallback_count() + 1
+                return source
+        default.kvstore.get_or_set(source)
+        default.kvstore.set(thumbnail, source)
+        return thumbnail
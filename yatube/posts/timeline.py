@@ -0,0 +1,96 @@
+"""Материализованная лента подписок (fan-out on write).
+
+Каждый новый пост раскладывается в ленты всех подписчиков автора,
+поэтому чтение ``follow_index`` — это диапазонное сканирование индекса
+``(user, -pub_date, -post)`` без соединения с ``Follow``.
+"""
+from itertools import islice
+
+from django.db import connections, router
+
+from .models import Follow, Post, TimelineEntry
+
+BATCH_SIZE = 1000
+
+
+def _entry(user_id, post_id, author_id, pub_date):
+    return TimelineEntry(
+        user_id=user_id,
+        post_id=post_id,
+        author_id=author_id,
+        pub_date=pub_date,
+    )
+
+
+def _insert(entries):
+    """Вставляет записи пачками, не загружая их все в память."""
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, BATCH_SIZE))
+        if not batch:
+            break
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out(post):
+    """Добавляет пост в ленты всех подписчиков автора."""
+    followers = Follow.objects.filter(
+        author_id=post.author_id
+    ).values_list('user_id', flat=True)
+    _insert(
+        _entry(user_id, post.pk, post.author_id, post.pub_date)
+        for user_id in followers.iterator()
+    )
+
+
+def backfill(user_id, author_id):
+    """Добавляет в ленту пользователя все посты автора."""
+    backfill_many(user_id, (author_id,))
+
+
+def backfill_many(user_id, author_ids):
+    """Добавляет в ленту пользователя все посты нескольких авторов."""
+    posts = Post.objects.filter(
+        author_id__in=author_ids
+    ).values_list('pk', 'author_id', 'pub_date')
+    _insert(
+        _entry(user_id, post_id, author_id, pub_date)
+        for post_id, author_id, pub_date in posts.iterator()
+    )
+
+
+def prune(user_id, author_id):
+    """Удаляет посты автора из ленты пользователя."""
+    prune_many(user_id, (author_id,))
+
+
+def prune_many(user_id, author_ids):
+    TimelineEntry.objects.filter(
+        user_id=user_id,
+        author_id__in=author_ids,
+    ).delete()
+
+
+def _column(meta, name):
+    return meta.get_field(name).column
+
+
+def rebuild():
+    """Пересобирает ленты всех пользователей по текущим подпискам.
+
+    Записи создаются одним ``INSERT ... SELECT`` из соединения подписок
+    с постами, без выборки строк в Python. Возвращает число записей.
+    """
+    TimelineEntry.objects.all().delete()
+    entry, follow, post = TimelineEntry._meta, Follow._meta, Post._meta
+    with connections[router.db_for_write(TimelineEntry)].cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {entry.db_table} ('
+            f'{_column(entry, "user")}, {_column(entry, "post")}, '
+            f'{_column(entry, "author")}, {_column(entry, "pub_date")}) '
+            f'SELECT f.{_column(follow, "user")}, p.{post.pk.column}, '
+            f'p.{_column(post, "author")}, p.{_column(post, "pub_date")} '
+            f'FROM {follow.db_table} f JOIN {post.db_table} p '
+            f'ON p.{_column(post, "author")} = f.{_column(follow, "author")}'
+        )
+        return cursor.rowcount
@@ -0,0 +1,236 @@
+"""Потоковый перенос данных в JSON Lines и CSV.
+
+Связи выгружаются естественными ключами (имя пользователя, slug группы),
+а посты и комментарии — со своими id, чтобы комментарии ссылались на те же
+посты. При загрузке ключи пачки разрешаются одним запросом на модель,
+а уже существующие строки (по первичному ключу или уникальному
+ограничению) пропускаются, поэтому повторная загрузка ничего не дублирует.
+
+Id из файла в непустой базе может принадлежать другой записи. Поэтому
+строка с id сверяется с найденной записью по полям ``identity`` (автор
+и время публикации поста), а ссылка комментария на пост — по автору
+и времени публикации поста из файла. Строка с чужим id или ссылкой на
+чужой пост не загружается и попадает в отчёт о конфликтах.
+"""
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+FORMATS = ('jsonl', 'csv')
+
+
+class Spec:
+    def __init__(self, model, fields, references=None, date_field=None,
+                 identity=()):
+        self.model = model
+        # Поле файла -> путь для values().
+        self.fields = fields
+        # Поле файла -> (поле модели, модель, поле ключа[, сверка]), где
+        # сверка: поле файла -> путь в связанной модели.
+        self.references = references or {}
+        self.date_field = date_field
+        # Поля модели, по которым строка с тем же id считается той же.
+        self.identity = identity
+
+
+SPECS = {
+    'groups': Spec(Group, {
+        'slug': 'slug',
+        'title': 'title',
+        'description': 'description',
+    }),
+    'posts': Spec(Post, {
+        'id': 'id',
+        'author': 'author__username',
+        'group': 'group__slug',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'image': 'image',
+    }, {
+        'author': ('author', User, 'username'),
+        'group': ('group', Group, 'slug'),
+    }, 'pub_date', ('author', 'pub_date')),
+    'comments': Spec(Comment, {
+        'id': 'id',
+        'post': 'post_id',
+        'post_author': 'post__author__username',
+        'post_pub_date': 'post__pub_date',
+        'author': 'author__username',
+        'text': 'text',
+        'created': 'created',
+    }, {
+        'post': ('post', Post, 'pk', {
+            'post_author': 'author__username',
+            'post_pub_date': 'pub_date',
+        }),
+        'author': ('author', User, 'username'),
+    }, 'created', ('post', 'author', 'created')),
+    'follows': Spec(Follow, {
+        'user': 'user__username',
+        'author': 'author__username',
+    }, {
+        'user': ('user', User, 'username'),
+        'author': ('author', User, 'username'),
+    }),
+}
+
+
+def export_rows(spec, chunk_size):
+    """Строки модели по возрастанию id, без загрузки таблицы в память."""
+    rows = spec.model.objects.order_by('pk').values_list(
+        *spec.fields.values()
+    )
+    for values in rows.iterator(chunk_size=chunk_size):
+        yield {
+            name: value.isoformat() if hasattr(value, 'isoformat') else value
+            for name, value in zip(spec.fields, values)
+        }
+
+
+def write_rows(rows, output, file_format, fields):
+    """Пишет строки; возвращает их число."""
+    count = 0
+    if file_format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=list(fields))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in rows:
+        output.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def read_rows(source, file_format):
+    if file_format == 'csv':
+        # В CSV нет null: пустая строка означает отсутствие значения.
+        for row in csv.DictReader(source):
+            yield {name: value or None for name, value in row.items()}
+        return
+    for line in source:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _checks(reference):
+    return reference[3] if len(reference) > 3 else {}
+
+
+def _resolve(spec, rows):
+    """Ключи связей пачки -> (id, значения для сверки), запрос на связь."""
+    resolved = {}
+    for name, reference in spec.references.items():
+        field, model, key = reference[:3]
+        values = {row[name] for row in rows if row.get(name) is not None}
+        paths = list(_checks(reference).values())
+        found = model.objects.filter(**{f'{key}__in': values}).values_list(
+            key, 'pk', *paths
+        ) if values else ()
+        resolved[name] = {
+            key_value: (pk, tuple(checked))
+            for key_value, pk, *checked in found
+        }
+    return resolved
+
+
+def _matches(model, checks, row, checked):
+    """Совпадают ли поля сверки из файла с найденной записью."""
+    for (name, path), value in zip(checks.items(), checked):
+        expected = row.get(name)
+        if expected is not None and '__' not in path:
+            expected = model._meta.get_field(path).to_python(expected)
+        if expected != value:
+            return False
+    return True
+
+
+def build_objects(spec, rows):
+    """Объекты модели для пачки.
+
+    Возвращает (объекты, пропущенные строки, id конфликтов). Строка
+    пропускается, если указанная в ней связь не найдена или отсутствует
+    обязательная связь; конфликт — её id или связь принадлежат другой
+    записи этой базы.
+    """
+    resolved = _resolve(spec, rows)
+    meta = spec.model._meta
+    objects = []
+    skipped = 0
+    conflicts = []
+    for row in rows:
+        values = {}
+        for name, path in spec.fields.items():
+            if name in spec.references:
+                reference = spec.references[name]
+                field, model, key = reference[:3]
+                value = row.get(name)
+                pk, checked = resolved[name].get(
+                    _key_value(model, key, value), (None, ())
+                )
+                if pk is not None and not _matches(
+                    model, _checks(reference), row, checked
+                ):
+                    conflicts.append(row.get('id') or value)
+                    break
+                if pk is None and (
+                    value is not None or not meta.get_field(field).null
+                ):
+                    skipped += 1
+                    break
+                values[meta.get_field(field).attname] = pk
+            elif '__' in path:
+                # Поле сверки связи, в модель не записывается.
+                continue
+            else:
+                field = meta.get_field(path)
+                value = _field_value(spec, field, row.get(name))
+                values[field.attname] = value
+        else:
+            objects.append(spec.model(**values))
+    objects, taken = _drop_taken_ids(spec, objects)
+    return objects, skipped, conflicts + taken
+
+
+def _drop_taken_ids(spec, objects):
+    """Убирает объекты, чей id в базе занят другой записью."""
+    if not spec.identity:
+        return objects, []
+    attnames = [spec.model._meta.get_field(name).attname
+                for name in spec.identity]
+    existing = {
+        pk: tuple(values) for pk, *values in spec.model.objects.filter(
+            pk__in=[obj.pk for obj in objects if obj.pk is not None]
+        ).values_list('pk', *attnames)
+    }
+    kept = []
+    taken = []
+    for obj in objects:
+        values = tuple(getattr(obj, attname) for attname in attnames)
+        if existing.get(obj.pk, values) == values:
+            kept.append(obj)
+        else:
+            taken.append(obj.pk)
+    return kept, taken
+
+
+def _field_value(spec, field, value):
+    if value is not None:
+        return field.to_python(value)
+    if field.name == spec.date_field:
+        return timezone.now()
+    # Пустое значение NOT NULL поля: '' для текста, None для id.
+    return None if field.null else field.get_default()
+
+
+def _key_value(model, key, value):
+    if value is None:
+        return None
+    return model._meta.pk.to_python(value) if key == 'pk' else value
@@ -1,77 +1,127 @@
-from django.core.paginator import Paginator
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
 
+from . import (
+    comments, conditional, counters, feed_cache, follows, queries, search
+)
+from .conditional import conditional_page
 from .forms import PostForm, CommentForm
-from .models import Post, Group, Follow
+from .models import Post, Group
+from .paginator import CursorPaginator
 
 
 User = get_user_model()
 
+POSTS_PER_PAGE = 10
 
+
+def get_page_obj(request, post_list, ordering=('-pub_date', '-id')):
+    paginator = CursorPaginator(post_list, POSTS_PER_PAGE, ordering)
+    return paginator.get_page(request.GET.get('cursor'))
+
+
+@conditional_page(conditional.index)
 def index(request):
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = queries.index_feed()
+    page_obj = get_page_obj(request, post_list)
     context = {
         'page_obj': page_obj,
         'index': True,
+        **feed_cache.get_context(request, 'index'),
     }
     return render(request, 'posts/index.html', context)
 
 
+@conditional_page(conditional.group_posts)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all().select_related('author')
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = queries.group_feed(group)
+    page_obj = get_page_obj(request, post_list)
     context = {
         'group': group,
         'page_obj': page_obj,
+        **feed_cache.get_context(request, f'group:{group.pk}'),
     }
     return render(request, 'posts/group_list.html', context)
 
 
+@conditional_page(conditional.profile)
 def profile(request, username):
-    auth = User.objects.get(username=username)
-    post_list = Post.objects.filter(author=auth.pk)
-    cnt = post_list.count()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    if request.user.is_authenticated:
-        following = Follow.objects.filter(
-            user=request.user,
-            author=auth
-        ).exists()
-    else:
-        following = False
+    auth = User.objects.select_related('stats').get(username=username)
+    post_list = queries.profile_feed(auth)
+    stats = counters.get_stats(auth)
+    page_obj = get_page_obj(request, post_list)
+    following = follows.is_following(request.user, auth.pk)
     context = {
-        'cnt': cnt,
+        'cnt': stats.post_count,
+        'stats': stats,
         'page_obj': page_obj,
         'auth': auth,
         'following': following,
+        **feed_cache.get_context(request, f'profile:{auth.pk}'),
     }
     return render(request, 'posts/profile.html', context)
 
 
+def trending(request):
+    context = {
+        'posts': queries.trending_feed(),
+        **feed_cache.get_context(request, feed_cache.TRENDING),
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def popular_groups(request):
+    context = {
+        'groups': queries.popular_groups(),
+        **feed_cache.get_context(request, feed_cache.POPULAR_GROUPS),
+    }
+    return render(request, 'posts/groups.html', context)
+
+
+def post_search(request):
+    query = request.GET.get('q', '').strip()
+    post_list, ordering = search.search(queries.post_feed(), query)
+    page_obj = get_page_obj(request, post_list, ordering)
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@conditional_page(conditional.post_detail)
 def post_detail(request, post_id):
-    post = Post.objects.get(pk=post_id)
+    post = Post.objects.select_related(
+        'author__stats', 'group'
+    ).get(pk=post_id)
     form = CommentForm()
-    comments = post.comments.all().select_related('author')
-    cnt = Post.objects.filter(author=post.author).count()
+    thread = comments.get_page(post.pk, request.GET.get('cursor'))
+    cnt = counters.get_stats(post.author).post_count
     context = {
         'post': post,
         'cnt': cnt,
-        'comments': comments,
+        'comments': thread['comments'],
+        'comments_next_cursor': thread['next_cursor'],
         'form': form,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def post_comments(request, post_id):
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
+    thread = comments.get_page(post_id, request.GET.get('cursor'))
+    return JsonResponse({
+        'comments': [
+            comments.to_dict(comment) for comment in thread['comments']
+        ],
+        'next_cursor': thread['next_cursor'],
+    })
+
+
 @login_required
 def post_create(request):
     form = PostForm(
@@ -120,36 +170,32 @@ def add_comment(request, post_id):
 
 
 @login_required
+@conditional_page(conditional.follow_index)
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    entries = queries.follow_feed(request.user)
+    page_obj = get_page_obj(request, entries, ('-pub_date', '-post_id'))
+    page_obj.object_list = [entry.post for entry in page_obj]
     context = {
         'page_obj': page_obj,
         'follow': True,
+        **feed_cache.get_context(
+            request, f'follow:{request.user.pk}', 'follow'
+        ),
     }
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
 def profile_follow(request, username):
-    if request.user.username == username:
-        return profile(request, username)
-    follow_author = get_object_or_404(User, username=username)
-    Follow.objects.get_or_create(
-        user=request.user,
-        author=follow_author,
-    )
-    return profile(request, username)
+    result = follows.apply(request.user, follow=(username,))
+    if result['not_found']:
+        raise Http404
+    return redirect('posts:profile', username=username)
 
 
 @login_required
 def profile_unfollow(request, username):
-    following_author = get_object_or_404(User, username=username)
-    del_follow = Follow.objects.filter(
-        user=request.user,
-        author=following_author
-    )
-    del_follow.delete()
-    return profile(request, username)
+    result = follows.apply(request.user, unfollow=(username,))
+    if result['not_found']:
+        raise Http404
+    return redirect('posts:profile', username=username)
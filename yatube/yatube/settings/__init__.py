@@ -0,0 +1,33 @@
+"""Настройки yatube.
+
+Профиль выбирает переменная окружения YATUBE_ENV: ``dev`` (по умолчанию),
+``prod`` или ``test``; ``manage.py test`` и pytest без YATUBE_ENV берут
+``test``. Профиль можно указать и явно:
+DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+import os
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ('dev', 'prod', 'test')
+
+
+def _default_profile():
+    if sys.argv[1:2] == ['test'] or 'pytest' in sys.modules:
+        return 'test'
+    return 'dev'
+
+
+_profile = os.environ.get('YATUBE_ENV') or _default_profile()
+if _profile not in PROFILES:
+    raise ImproperlyConfigured(
+        f'YATUBE_ENV={_profile!r}: ожидается одно из {", ".join(PROFILES)}'
+    )
+
+if _profile == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif _profile == 'test':
+    from .test import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
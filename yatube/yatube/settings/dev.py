@@ -0,0 +1,14 @@
+"""Профиль разработки: отладка и раздача /media/ самим Django."""
+from copy import deepcopy
+
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATE_LOADERS, TEMPLATES
+
+DEBUG = True
+
+SERVE_MEDIA = True
+
+# Изменённые шаблоны видны без перезапуска сервера. Копия — чтобы
+# не изменить base для профиля, импортированного в том же процессе.
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['OPTIONS']['loaders'] = TEMPLATE_LOADERS
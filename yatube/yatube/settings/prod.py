@@ -0,0 +1,48 @@
+"""Боевой профиль; значения, зависящие от окружения, — из переменных.
+
+YATUBE_SECRET_KEY        — секретный ключ, обязателен;
+YATUBE_ALLOWED_HOSTS     — домены через запятую;
+YATUBE_CONN_MAX_AGE      — время жизни соединения с базой в секундах,
+                           по умолчанию соединение не закрывается;
+YATUBE_CACHE_MAX_SIZE_MB — предельный размер кеша.
+
+При старте процесса настройки проверяет core/checks.py.
+"""
+import os
+from copy import deepcopy
+
+from .base import *  # noqa: F401,F403
+from .base import CACHES, DATABASES
+
+DEBUG = False
+
+PRODUCTION = True
+
+SECRET_KEY = os.environ.get('YATUBE_SECRET_KEY', '')
+
+ALLOWED_HOSTS = list(
+    filter(None, os.environ.get('YATUBE_ALLOWED_HOSTS', '').split(','))
+)
+
+# Постоянные соединения: без переподключения и PRAGMA на каждый запрос.
+DATABASES = deepcopy(DATABASES)
+_conn_max_age = os.environ.get('YATUBE_CONN_MAX_AGE')
+for _database in DATABASES.values():
+    _database['CONN_MAX_AGE'] = int(_conn_max_age) if _conn_max_age else None
+
+# Кеш общий для всех воркеров: больше места и мягче чистка —
+# при переполнении удаляется десятая часть записей, а не треть.
+CACHES = deepcopy(CACHES)
+CACHES['default']['OPTIONS'].update({
+    'MAX_ENTRIES': 100000,
+    'MAX_SIZE': int(
+        os.environ.get('YATUBE_CACHE_MAX_SIZE_MB', 512)
+    ) * 1024 * 1024,
+    'CULL_FREQUENCY': 10,
+})
+
+# Имена с хешем содержимого и сжатые копии, см. core/storage.py.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Сессия читается из кеша, а не из базы на каждый запрос.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
@@ -0,0 +1,14 @@
+"""Профиль тестов."""
+from .dev import *  # noqa: F401,F403
+
+# Миниатюры строятся в процессе теста, а не в фоновом пуле, чтобы пул
+# не писал во временный MEDIA_ROOT после его удаления.
+THUMBNAIL_WORKERS = 0
+
+# Кеш в памяти процесса: тесты не трогают файл кеша сервера разработки,
+# и записи прошлых запусков не попадают в следующие.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
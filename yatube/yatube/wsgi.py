@@ -13,4 +13,9 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
-application = get_wsgi_application()
+django_application = get_wsgi_application()
+
+from core.static import FilesApplication  # noqa: E402
+
+# Статику и медиа отдаёт обёртка, не занимая Django.
+application = FilesApplication(django_application)